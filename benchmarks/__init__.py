@@ -0,0 +1,6 @@
+"""
+Benchmarks for the HDFury integration protocol path.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
@@ -0,0 +1,239 @@
+"""
+Protocol-path benchmarks for HDFuryDevice against the loopback simulator.
+
+Run from the repository root::
+
+    python -m benchmarks.bench --model vrroom --latency 0.005 --jitter 0.002
+    python -m benchmarks.bench --write-baseline benchmarks/baseline.json
+    python -m benchmarks.bench --baseline benchmarks/baseline.json
+
+Every model is benchmarked ``--runs`` times and each metric is reported as the median over
+the runs, for the baseline and the gate alike. With ``--baseline`` the run exits non-zero
+when a median metric regresses by more than ``--tolerance`` (and, for timings, by more than
+MIN_DELTA_MS) against the stored results. Tail percentiles and the connect timing are
+reported but not compared: on a loopback they mostly measure the scheduler.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from ucapi.remote import Commands
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.device import HDFuryDevice
+from uc_intg_hdfury.models import MODEL_CONFIGS
+from uc_intg_hdfury.remote import HDFuryRemote
+
+HIGHER_IS_BETTER = {"throughput_cmd_s"}
+COMPARED = {
+    "poll_ms",
+    "rtt_p50_ms",
+    "throughput_cmd_s",
+    "set_source_p50_ms",
+    "set_during_poll_p50_ms",
+    "sequence_ms",
+}
+# Below this a timing change is scheduler granularity, not a regression.
+MIN_DELTA_MS = 0.5
+THROUGHPUT_ROUNDS = 5
+SEQUENCE = ["set_source_HDMI_1", "set_edidmode_automix", "set_hdrcustom_off", "hotplug"]
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Return p50/p90/p99 of *samples* in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50": value, "p90": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p90": cuts[89] * 1000, "p99": cuts[98] * 1000}
+
+
+def create_device(simulator: HDFurySimulator, model_id: str) -> HDFuryDevice:
+    return HDFuryDevice(
+        HDFuryConfig(
+            identifier=f"bench_{model_id}",
+            name=f"Bench {model_id}",
+            address=simulator.host,
+            port=simulator.port,
+            model_id=model_id,
+        )
+    )
+
+
+async def bench_model(model_id: str, args: argparse.Namespace) -> dict[str, float]:
+    profile = default_profile(
+        model_id,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        unsolicited_interval=args.unsolicited,
+        seed=args.seed,
+    )
+    results: dict[str, float] = {}
+    async with HDFurySimulator(profile) as simulator:
+        device = create_device(simulator, model_id)
+        start = time.perf_counter()
+        await device.establish_connection()
+        results["connect_ms"] = (time.perf_counter() - start) * 1000
+        try:
+            poll_times = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                await device._poll_state()
+                poll_times.append(time.perf_counter() - start)
+            results["poll_ms"] = statistics.median(poll_times) * 1000
+
+            rtts = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                await device._send_command("get ver")
+                rtts.append(time.perf_counter() - start)
+            for name, value in percentiles(rtts).items():
+                results[f"rtt_{name}_ms"] = value
+
+            commands = [query.command for query in device._status_queries]
+            batches = max(1, args.iterations // THROUGHPUT_ROUNDS)
+            rates = []
+            for _ in range(THROUGHPUT_ROUNDS):
+                start = time.perf_counter()
+                await asyncio.gather(*(device._send_batch(commands) for _ in range(batches)))
+                rates.append(len(commands) * batches / (time.perf_counter() - start))
+            results["throughput_cmd_s"] = statistics.median(rates)
+
+            if device.setting_command("source", device.source_list[-1]):
+                source_times = []
+                for index in range(args.iterations):
+                    source = device.source_list[index % len(device.source_list)]
+                    start = time.perf_counter()
+                    await device.set_source(source)
+                    source_times.append(time.perf_counter() - start)
+                for name, value in percentiles(source_times).items():
+                    results[f"set_source_{name}_ms"] = value
+
+            contended_times = []
+            for _ in range(args.iterations):
+                poll = asyncio.create_task(device._poll_state())
+                await asyncio.sleep(0)
+                start = time.perf_counter()
+                await device.apply_setting("hotplug")
+                contended_times.append(time.perf_counter() - start)
+                await poll
+            for name, value in percentiles(contended_times).items():
+                results[f"set_during_poll_{name}_ms"] = value
+
+            remote = HDFuryRemote(device.device_config, device)
+            sequence = [command for command in SEQUENCE if command in remote._commands]
+            sequence_times = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                await remote._handle_command(
+                    remote, Commands.SEND_CMD_SEQUENCE, {"sequence": sequence}
+                )
+                sequence_times.append(time.perf_counter() - start)
+            results["sequence_ms"] = statistics.median(sequence_times) * 1000
+            device.unsubscribe_entity(remote)
+        finally:
+            await device.close_connection()
+
+    return results
+
+
+def median_results(runs: list[dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    """Return the median of every metric over several runs of the whole benchmark."""
+    merged: dict[str, dict[str, list[float]]] = {}
+    for run in runs:
+        for model_id, metrics in run.items():
+            for metric, value in metrics.items():
+                merged.setdefault(model_id, {}).setdefault(metric, []).append(value)
+    return {
+        model_id: {metric: statistics.median(values) for metric, values in metrics.items()}
+        for model_id, metrics in merged.items()
+    }
+
+
+def print_results(results: dict[str, dict[str, float]]) -> None:
+    for model_id, metrics in results.items():
+        print(model_id)
+        for metric, value in metrics.items():
+            print(f"  {metric:<20}{value:>12.2f}")
+
+
+def compare(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Return a description of every compared metric that regressed against *baseline*."""
+    regressions = []
+    for model_id, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(model_id, {}).get(metric)
+            if reference is None or metric not in COMPARED:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < reference * (1 - tolerance)
+            else:
+                regressed = (
+                    value > reference * (1 + tolerance) and value - reference > MIN_DELTA_MS
+                )
+            if regressed:
+                regressions.append(f"{model_id} {metric}: {reference:.2f} -> {value:.2f}")
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", choices=list(MODEL_CONFIGS), action="append")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5, help="report the median of this many runs")
+    parser.add_argument("--latency", type=float, default=0.002, help="per-command delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="max extra delay (s)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of lost replies")
+    parser.add_argument("--unsolicited", type=float, default=None, help="notification period (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON baseline")
+    parser.add_argument("--write-baseline", type=Path, help="write results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("ucapi", "ucapi.api", "ucapi.entity", "ucapi.entities"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    runs = []
+    for _ in range(max(1, args.runs)):
+        runs.append(
+            {model_id: await bench_model(model_id, args) for model_id in args.model or MODEL_CONFIGS}
+        )
+    results = median_results(runs)
+    print_results(results)
+
+    if args.write_baseline:
+        args.write_baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.write_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
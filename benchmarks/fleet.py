@@ -0,0 +1,134 @@
+"""
+Per-device memory, CPU and task cost of the HDFury driver as the fleet grows.
+
+Run from the repository root::
+
+    python -m benchmarks.fleet --sizes 1,10,50 --duration 10
+
+The simulator runs in a child process so only the driver side is measured.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from ucapi_framework import BaseConfigManager
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.driver import HDFuryDriver
+from uc_intg_hdfury.models import MODEL_CONFIGS
+
+
+def _serve(model_id: str, connection) -> None:
+    async def run() -> None:
+        async with HDFurySimulator(default_profile(model_id)) as simulator:
+            connection.send(simulator.port)
+            await asyncio.Future()
+
+    asyncio.run(run())
+
+
+async def _wait_until_ready(driver: HDFuryDriver, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    devices = list(driver._device_instances.values())
+    while time.monotonic() < deadline:
+        if all(device._connected() and device._settings for device in devices):
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+async def bench_fleet(size: int, port: int, args: argparse.Namespace) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    tasks_before = len(asyncio.all_tasks())
+    memory_before = tracemalloc.get_traced_memory()[0]
+
+    driver = HDFuryDriver()
+    config_manager = BaseConfigManager(tempfile.mkdtemp(), config_class=HDFuryConfig)
+    for index in range(size):
+        config_manager.add_or_update(
+            HDFuryConfig(
+                identifier=f"fleet_{index}",
+                name=f"Fleet {index}",
+                address="127.0.0.1",
+                port=port,
+                model_id=args.model,
+            )
+        )
+    driver.config_manager = config_manager
+
+    start = time.perf_counter()
+    await driver.register_all_device_instances(connect=True)
+    ready = await _wait_until_ready(driver, timeout=30.0)
+    startup = time.perf_counter() - start
+
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - memory_before
+    tracemalloc.stop()
+    tasks = len(asyncio.all_tasks()) - tasks_before
+
+    cpu_start = time.process_time()
+    await asyncio.sleep(args.duration)
+    cpu = time.process_time() - cpu_start
+
+    for device in list(driver._device_instances.values()):
+        await device.disconnect()
+    await asyncio.sleep(0)  # let the entity updates queued by the disconnects run
+
+    return {
+        "ready": float(ready),
+        "startup_ms": startup * 1000,
+        "tasks_per_device": tasks / size,
+        "memory_kb_per_device": memory / size / 1024,
+        "cpu_ms_per_device_s": cpu * 1000 / size / args.duration,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", choices=list(MODEL_CONFIGS), default="vrroom")
+    parser.add_argument("--sizes", default="1,10,50", help="comma-separated fleet sizes")
+    parser.add_argument("--duration", type=float, default=10.0, help="idle window for CPU (s)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("ucapi", "ucapi.api", "ucapi.entity", "ucapi.entities"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    logging.getLogger("ucapi_framework").setLevel(logging.CRITICAL)
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(args.model, child), daemon=True)
+    server.start()
+    port = parent.recv()
+    try:
+        print(f"{'devices':>8}{'startup ms':>12}{'tasks/dev':>11}{'KB/dev':>9}{'CPU ms/s/dev':>14}")
+        for size in (int(value) for value in args.sizes.split(",")):
+            result = await bench_fleet(size, port, args)
+            print(
+                f"{size:>8}{result['startup_ms']:>12.1f}{result['tasks_per_device']:>11.1f}"
+                f"{result['memory_kb_per_device']:>9.1f}{result['cpu_ms_per_device_s']:>14.3f}"
+                + ("" if result["ready"] else "  (not all devices ready)")
+            )
+    finally:
+        server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,225 @@
+"""
+Loopback simulator of the HDFury ASCII control protocol.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+
+from uc_intg_hdfury.models import (
+    MODEL_CONFIGS,
+    ModelConfig,
+    get_setting_names,
+    get_source_list,
+)
+
+_LOG = logging.getLogger(__name__)
+
+INPUT_STATUS = {
+    "rx0": "RX0: 4K60 444 10b HDR10",
+    "audout": "AUDOUT: LPCM 2.0 48kHz",
+}
+OUTPUT_STATUS = {
+    "tx{n}": "TX{n}: 4K60 444 10b HDR10",
+    "tx{n}sink": "TX{n}SINK: LG OLED65C2",
+    "aud{n}": "AUD{n}: Dolby TrueHD Atmos",
+}
+
+
+@dataclass
+class SimulatorProfile:
+    """Behaviour of one simulated device."""
+
+    model: ModelConfig
+    firmware: str = "0.63"
+    latency: float = 0.002
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    unsolicited_interval: float | None = None
+    echo_sets: bool = False
+    prompt: bool = True
+    seed: int | None = None
+    settings: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        return f"{self.model.display_name.upper().replace(' ', '')} FW {self.firmware}"
+
+
+def default_profile(model_id: str, **kwargs) -> SimulatorProfile:
+    """Return a simulator profile for the model with id *model_id*."""
+    return SimulatorProfile(model=MODEL_CONFIGS[model_id], **kwargs)
+
+
+def _initial_settings(model: ModelConfig) -> dict[str, str]:
+    choices = {
+        "edidmode": model.edid_modes,
+        "hdcp": model.hdcp_modes,
+        "edidaudio": model.edid_audio_sources,
+        "earcforce": model.earc_force_modes,
+        "arcforce": model.arc_force_modes,
+        "scale": model.scale_modes,
+        "audiomode": model.audio_modes,
+        "led": list(model.led_modes) if model.led_modes else None,
+        "colorspace": model.color_space_modes,
+        "deepcolor": model.deep_color_modes,
+        "outres": model.output_resolutions,
+    }
+    settings = {}
+    for setting in get_setting_names(model):
+        options = choices.get(setting)
+        settings[setting] = options[0] if options else "off"
+    if "hdcp" in settings and settings["hdcp"] == "14":
+        settings["hdcp"] = "1.4"
+    if model.model_id == "arcana2" and "scale" in settings:
+        settings["scalemode"] = settings.pop("scale")
+    return settings
+
+
+class HDFurySimulator:
+    """Asyncio TCP server that answers like an HDFury device of the profile's model."""
+
+    def __init__(self, profile: SimulatorProfile, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile
+        self.host = host
+        self.port = port
+        self.input = 0
+        self.settings = _initial_settings(profile.model)
+        self.settings.update(profile.settings)
+        self.status = dict(INPUT_STATUS)
+        for output in range(profile.model.matrix_outputs or 0):
+            for target, reply in OUTPUT_STATUS.items():
+                self.status[target.format(n=output)] = reply.format(n=output)
+        self.received: list[str] = []
+        self._random = random.Random(profile.seed)
+        self._server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+        self._notifier: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.profile.unsolicited_interval:
+            self._notifier = asyncio.create_task(self._notify_loop())
+
+    async def stop(self) -> None:
+        if self._notifier:
+            self._notifier.cancel()
+        for task in self._handlers:
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> HDFurySimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def notify(self, line: str) -> None:
+        """Send *line* to every connected client, as the device does with IP interrupts."""
+        for writer in self._writers:
+            writer.write(f"{line}\r\n".encode("ascii"))
+
+    def select_input(self, index: int) -> None:
+        """Simulate an input change from the front panel or IR remote."""
+        self.input = index
+        self.notify(f"insel {index}")
+
+    async def _notify_loop(self) -> None:
+        sources = max(len(get_source_list(self.profile.model)), 1)
+        while True:
+            await asyncio.sleep(self.profile.unsolicited_interval)
+            self.select_input(self._random.randrange(sources))
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("ascii", errors="replace").strip()
+                if not command:
+                    continue
+                self.received.append(command)
+
+                delay = self.profile.latency
+                if self.profile.jitter:
+                    delay += self._random.uniform(0, self.profile.jitter)
+                if delay:
+                    await asyncio.sleep(delay)
+
+                if self._random.random() < self.profile.drop_rate:
+                    continue
+
+                reply = self._respond(command)
+                out = f"{reply}\r\n" if reply else ""
+                if self.profile.prompt:
+                    out += ">"
+                if out:
+                    writer.write(out.encode("ascii"))
+                    await writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def _respond(self, command: str) -> str | None:
+        parts = command.split()
+        if len(parts) < 2 or parts[0] not in ("get", "set"):
+            return None
+
+        if parts[0] == "get":
+            return self._get(parts[1:])
+        return self._set(parts[1:])
+
+    def _get(self, args: list[str]) -> str | None:
+        model = self.profile.model
+        keyword = args[0]
+        outputs = model.matrix_outputs or 0
+
+        if keyword == "ver":
+            return self.profile.version
+        if keyword == "insel":
+            return f"insel {self.input}"
+        if keyword == "status" and len(args) > 1:
+            return self.status.get(args[1])
+        if keyword.startswith("audiomodetx") and keyword[len("audiomodetx"):].isdigit():
+            if int(keyword[len("audiomodetx"):]) < outputs:
+                return f"{keyword} auto"
+            return None
+        if keyword in self.settings:
+            return f"{keyword} {self.settings[keyword]}"
+        return None
+
+    def _set(self, args: list[str]) -> str | None:
+        keyword = args[0]
+        value = args[1] if len(args) > 1 else ""
+
+        if keyword in ("input", self.profile.model.source_command):
+            index = {"top": 0, "bot": 1}.get(value, int(value) if value.isdigit() else None)
+            if index is None:
+                return None
+            self.input = index
+        elif keyword in self.settings:
+            self.settings[keyword] = value
+        elif keyword not in ("hotplug", "reboot"):
+            return None
+
+        if self.profile.echo_sets:
+            return f"{keyword} {value}".strip()
+        return None
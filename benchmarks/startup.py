@@ -0,0 +1,147 @@
+"""
+Cold-start cost of the HDFury integration.
+
+Run from the repository root::
+
+    python -m benchmarks.startup --devices 3 --runs 5
+
+Reports the slowest modules from ``python -X importtime`` and, for a driver process started
+against simulated devices, the time until the device state is reported and until every
+device is connected.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from ucapi_framework import BaseConfigManager
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.models import MODEL_CONFIGS
+
+STATE_MARKER = "Startup:"
+READY_MARKER = "device(s) ready"
+
+
+def import_times(module: str, top: int) -> list[tuple[int, str]]:
+    """Return the *top* modules by cumulative import time in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(times, reverse=True)[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def time_startup(port: int, args: argparse.Namespace) -> tuple[float, float | None]:
+    """Start the driver once and return seconds to device state and to all devices ready."""
+    config_home = tempfile.mkdtemp()
+    config_manager = BaseConfigManager(config_home, config_class=HDFuryConfig)
+    for index in range(args.devices):
+        config_manager.add_or_update(
+            HDFuryConfig(
+                identifier=f"startup_{index}",
+                name=f"Startup {index}",
+                address="127.0.0.1",
+                port=port,
+                model_id=args.model,
+            )
+        )
+
+    env = dict(
+        os.environ,
+        UC_CONFIG_HOME=config_home,
+        UC_DISABLE_MDNS_PUBLISH="true",
+        UC_INTEGRATION_HTTP_PORT=str(_free_port()),
+        PYTHONUNBUFFERED="1",
+    )
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uc_intg_hdfury",
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    state = ready = None
+    try:
+        async with asyncio.timeout(args.timeout):
+            while ready is None:
+                line = (await process.stderr.readline()).decode(errors="replace")
+                if not line:
+                    break
+                if state is None and STATE_MARKER in line:
+                    state = time.perf_counter() - start
+                elif READY_MARKER in line:
+                    ready = time.perf_counter() - start
+    except TimeoutError:
+        pass
+    finally:
+        process.terminate()
+        await process.wait()
+    if state is None:
+        raise RuntimeError("driver did not report its device state")
+    return state, ready
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", choices=list(MODEL_CONFIGS), default="vrroom")
+    parser.add_argument("--devices", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="modules to list from -X importtime")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    package_ms = import_times("uc_intg_hdfury", 1)[0][0] / 1000
+    print(f"import uc_intg_hdfury: {package_ms:.1f} ms\n")
+    print("slowest imports of the driver stack (cumulative ms):")
+    for micros, module in import_times("uc_intg_hdfury.driver", args.top):
+        print(f"{micros / 1000:>9.1f}  {module}")
+
+    async with HDFurySimulator(default_profile(args.model)) as simulator:
+        states, readies = [], []
+        for _ in range(args.runs):
+            state, ready = await time_startup(simulator.port, args)
+            states.append(state * 1000)
+            if ready is not None:
+                readies.append(ready * 1000)
+
+    print(f"\n{args.devices} device(s), median of {args.runs} runs:")
+    print(f"  process start -> device state     {statistics.median(states):8.1f} ms")
+    if readies:
+        print(f"  process start -> all devices ready {statistics.median(readies):7.1f} ms")
+    else:
+        print("  devices did not all become ready")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
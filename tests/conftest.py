@@ -0,0 +1,97 @@
+"""
+Shared test helpers: an unconnected device and a device connected to the loopback simulator.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.device import HDFuryDevice
+
+
+def make_device(model_id: str = "vrroom", **kwargs) -> HDFuryDevice:
+    """Return a device that is not connected to anything."""
+    return HDFuryDevice(
+        HDFuryConfig(
+            identifier="test",
+            name="Test",
+            address="127.0.0.1",
+            port=2220,
+            model_id=model_id,
+            **kwargs,
+        )
+    )
+
+
+class SentCommands(list):
+    """Stands in for HDFuryDevice._send_batch, answering every command with *reply*.
+
+    Commands listed in *failing* get no reply. Each call is kept in *batches*.
+    """
+
+    def __init__(self, reply: str | None = "", failing: tuple[str, ...] = ()):
+        super().__init__()
+        self.reply = reply
+        self.failing = failing
+        self.batches: list[list[str]] = []
+
+    async def __call__(self, commands: list[str], *args, **kwargs) -> list[str | None]:
+        self.extend(commands)
+        self.batches.append(list(commands))
+        return [None if command in self.failing else self.reply for command in commands]
+
+
+def record_commands(device: HDFuryDevice, **kwargs) -> SentCommands:
+    """Answer *device*'s requests with a SentCommands recorder, as if it were connected."""
+    device._send_batch = sent = SentCommands(**kwargs)
+    device._connected = lambda: True
+    return sent
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> None:
+    """Wait until *predicate* holds, failing the test after *timeout* seconds."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+def make_config(simulator: HDFurySimulator, **kwargs) -> HDFuryConfig:
+    return HDFuryConfig(
+        identifier="test",
+        name="Test",
+        address=simulator.host,
+        port=simulator.port,
+        model_id=simulator.profile.model.model_id,
+        **kwargs,
+    )
+
+
+def synced(device: HDFuryDevice) -> bool:
+    """Return True once the device has read its status and settings after connecting."""
+    return bool(device.get_sensor_value("video_input") and device.get_setting("edidmode"))
+
+
+@pytest.fixture
+def profile():
+    return default_profile("vrroom")
+
+
+@pytest.fixture
+async def simulator(profile):
+    async with HDFurySimulator(profile) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+async def device(simulator):
+    """A device that is connected to the simulator and has finished its initial sync."""
+    device = HDFuryDevice(make_config(simulator))
+    await device.connect()
+    await wait_until(lambda: synced(device))
+    yield device
+    await device.disconnect()
@@ -0,0 +1,41 @@
+"""Benchmark regression gate."""
+
+from benchmarks.bench import MIN_DELTA_MS, compare, median_results
+
+
+def test_slower_timing_beyond_tolerance_and_floor_regresses():
+    baseline = {"vrroom": {"poll_ms": 10.0}}
+    assert compare({"vrroom": {"poll_ms": 10.0 + MIN_DELTA_MS + 2}}, baseline, 0.1)
+    assert not compare({"vrroom": {"poll_ms": 10.9}}, baseline, 0.1)
+
+
+def test_small_absolute_change_never_regresses():
+    baseline = {"vrroom": {"rtt_p50_ms": 1.0}}
+    assert not compare({"vrroom": {"rtt_p50_ms": 1.0 + MIN_DELTA_MS * 0.9}}, baseline, 0.1)
+
+
+def test_doubled_set_latency_regresses():
+    baseline = {"vrroom": {"set_source_p50_ms": 2.5}}
+    assert compare({"vrroom": {"set_source_p50_ms": 5.0}}, baseline, 0.15)
+
+
+def test_lower_throughput_regresses():
+    baseline = {"vrroom": {"throughput_cmd_s": 400.0}}
+    assert compare({"vrroom": {"throughput_cmd_s": 300.0}}, baseline, 0.1) == [
+        "vrroom throughput_cmd_s: 400.00 -> 300.00"
+    ]
+    assert not compare({"vrroom": {"throughput_cmd_s": 500.0}}, baseline, 0.1)
+
+
+def test_metrics_missing_from_the_baseline_are_ignored():
+    assert not compare({"diva": {"poll_ms": 100.0}}, {"vrroom": {"poll_ms": 1.0}}, 0.1)
+
+
+def test_tail_percentiles_and_connect_time_are_not_compared():
+    baseline = {"vrroom": {"rtt_p99_ms": 3.0, "connect_ms": 4.0}}
+    assert not compare({"vrroom": {"rtt_p99_ms": 30.0, "connect_ms": 40.0}}, baseline, 0.1)
+
+
+def test_results_are_the_median_of_the_runs():
+    runs = [{"vrroom": {"poll_ms": value}} for value in (30.0, 10.0, 11.0)]
+    assert median_results(runs) == {"vrroom": {"poll_ms": 11.0}}
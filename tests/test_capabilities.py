@@ -0,0 +1,81 @@
+"""Probing which queries a device answers, against the loopback simulator."""
+
+import pytest
+from conftest import make_config, synced, wait_until
+from ucapi_framework import BaseConfigManager
+
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.device import PROBE_CONNECTIONS, HDFuryDevice
+from uc_intg_hdfury.setup_flow import HDFurySetupFlow
+
+
+@pytest.fixture
+def config_manager(tmp_path):
+    return BaseConfigManager(str(tmp_path), config_class=HDFuryConfig)
+
+
+async def _sync(simulator, config_manager) -> HDFuryDevice:
+    config = config_manager.get("test") or make_config(simulator)
+    config_manager.add_or_update(config)
+    device = HDFuryDevice(config, config_manager=config_manager)
+    await device.connect()
+    await wait_until(lambda: synced(device) and device._sync_task.done())
+    await device.disconnect()
+    return device
+
+
+async def test_unanswered_queries_are_recorded_and_no_longer_sent(simulator, config_manager):
+    del simulator.settings["cec"]
+    for connection in range(1, PROBE_CONNECTIONS):
+        device = await _sync(simulator, config_manager)
+        assert device.metrics.retries == {"get cec": 1}
+        stored = BaseConfigManager(config_manager.data_path, config_class=HDFuryConfig).get("test")
+        assert stored.query_misses == {"get cec": connection}
+        assert stored.unsupported_queries == []
+    device = await _sync(simulator, config_manager)
+    assert device._config.unsupported_queries == ["get cec"]
+    assert device._config.query_misses == {}
+    assert device._config.probed_firmware == simulator.profile.version
+    assert "cec" not in device._setting_keywords.values()
+
+    stored = BaseConfigManager(config_manager.data_path, config_class=HDFuryConfig).get("test")
+    assert stored.unsupported_queries == ["get cec"]
+
+    simulator.received.clear()
+    await _sync(simulator, config_manager)
+    assert "get cec" not in simulator.received
+
+
+async def test_an_answer_clears_the_misses(simulator, config_manager):
+    del simulator.settings["cec"]
+    await _sync(simulator, config_manager)
+
+    simulator.settings["cec"] = "on"
+    device = await _sync(simulator, config_manager)
+    assert device._config.query_misses == {}
+    assert device.get_setting("cec") == "on"
+
+
+async def test_new_firmware_probes_every_query_again(simulator, config_manager):
+    del simulator.settings["cec"]
+    for _ in range(PROBE_CONNECTIONS):
+        await _sync(simulator, config_manager)
+
+    simulator.settings["cec"] = "on"
+    simulator.profile.firmware = "0.64"
+    device = await _sync(simulator, config_manager)
+    assert device._config.unsupported_queries == []
+    assert device.get_setting("cec") == "on"
+
+
+async def test_running_setup_again_probes_every_query_again(simulator, config_manager):
+    del simulator.settings["cec"]
+    for _ in range(PROBE_CONNECTIONS):
+        await _sync(simulator, config_manager)
+
+    setup_flow = HDFurySetupFlow(config_manager, driver=None)
+    config = await setup_flow.query_device(
+        {"model": "vrroom", "address": simulator.host, "port": simulator.port}
+    )
+    assert config.unsupported_queries == []
+    assert config.query_misses == {}
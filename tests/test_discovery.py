@@ -0,0 +1,46 @@
+"""HDFuryDiscovery against simulated devices on loopback."""
+
+import asyncio
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.discovery import HDFuryDiscovery
+
+LOOPBACK = "127.0.0.1/32"
+
+
+async def test_finds_and_identifies_a_simulated_device():
+    async with HDFurySimulator(default_profile("diva")) as simulator:
+        discovery = HDFuryDiscovery(LOOPBACK, ports=[simulator.port], timeout=2)
+        (device,) = await discovery.discover()
+    assert device.address == "127.0.0.1"
+    assert device.name == "HDFury DIVA"
+    assert device.extra_data["model"] == "diva"
+    assert device.extra_data["port"] == simulator.port
+
+
+async def test_ignores_hosts_that_do_not_name_a_known_model():
+    async def handle(reader, writer):
+        await reader.readline()
+        writer.write(b"SSH-2.0-OpenSSH\r\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        assert await HDFuryDiscovery(LOOPBACK, ports=[port], timeout=2).discover() == []
+
+
+async def test_skips_a_banner_before_the_version():
+    async def handle(reader, writer):
+        writer.write(b"Welcome>")
+        await reader.readline()
+        writer.write(b"VRROOM-50 FW 0.63\r\n>")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        (device,) = await HDFuryDiscovery(LOOPBACK, ports=[port], timeout=2).discover()
+    assert device.extra_data["model"] == "vrroom"
@@ -0,0 +1,48 @@
+"""HDFuryDriver entity bookkeeping."""
+
+import asyncio
+
+import pytest
+
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.driver import HDFuryDriver
+
+
+def _listener_owners(device) -> set[int]:
+    return {
+        id(listener.__self__)
+        for event in device.events.event_names()
+        for listener in device.events.listeners(event)
+        if hasattr(listener, "__self__")
+    }
+
+
+async def test_model_switch_unsubscribes_replaced_entities():
+    driver = HDFuryDriver()
+    config = HDFuryConfig(identifier="test", name="Test", address="127.0.0.1", port=2220)
+    driver.add_configured_device(config, connect=False)
+    device = driver._device_instances["test"]
+    available, configured = driver.api.available_entities, driver.api.configured_entities
+    for entity in available.get_all():
+        configured.add(available.get(entity["entity_id"]))
+    old = [configured.get(entity["entity_id"]) for entity in configured.get_all()]
+
+    device._check_model("DR.HDMI-8K 0.63")
+
+    current = [available.get(entity["entity_id"]) for entity in available.get_all()]
+    assert len(current) < len(old)
+    assert not _listener_owners(device) & {id(entity) for entity in old}
+    assert {id(configured.get(entity["entity_id"])) for entity in configured.get_all()} <= {
+        id(entity) for entity in current
+    }
+
+
+async def test_metrics_server_is_closed_on_shutdown():
+    driver = HDFuryDriver()
+    await driver.start_metrics_server(0)
+    port = driver._metrics_server.sockets[0].getsockname()[1]
+
+    await driver.stop_metrics_server()
+    assert driver._metrics_server is None
+    with pytest.raises(OSError):
+        await asyncio.open_connection("127.0.0.1", port)
@@ -0,0 +1,44 @@
+"""Fleet-wide poll timer."""
+
+import asyncio
+
+from uc_intg_hdfury.fleet import FleetTimer
+
+
+async def _fired(event: asyncio.Event, within: float) -> bool:
+    try:
+        await asyncio.wait_for(event.wait(), within)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+async def test_wakes_each_device_after_its_delay():
+    timer = FleetTimer()
+    slow, fast = asyncio.Event(), asyncio.Event()
+    timer.wake_after("slow", slow, 0.2)
+    timer.wake_after("fast", fast, 0.02)
+    assert len(timer) == 2
+
+    assert await _fired(fast, 0.1)
+    assert not slow.is_set()
+    assert await _fired(slow, 0.5)
+    assert len(timer) == 0
+
+
+async def test_new_wakeup_replaces_the_pending_one():
+    timer = FleetTimer()
+    event = asyncio.Event()
+    timer.wake_after("device", event, 0.02)
+    timer.wake_after("device", event, 0.3)
+    assert not await _fired(event, 0.1)
+    assert len(timer) == 1
+
+
+async def test_cancelled_wakeup_never_fires():
+    timer = FleetTimer()
+    event = asyncio.Event()
+    timer.wake_after("device", event, 0.02)
+    timer.cancel("device")
+    assert not await _fired(event, 0.1)
+    assert len(timer) == 0
@@ -0,0 +1,258 @@
+"""HDFuryDevice end to end against the loopback simulator."""
+
+import asyncio
+
+from conftest import make_config, synced, wait_until
+from ucapi import StatusCodes
+from ucapi.remote import Commands
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.device import (
+    HEARTBEAT_INTERVAL,
+    MAX_MISSED_REPLIES,
+    OFFLINE_TTL,
+    SETTINGS_RECONCILE_INTERVAL,
+    HDFuryDevice,
+)
+from uc_intg_hdfury.remote import HDFuryRemote
+
+
+async def test_device_is_unavailable_until_connected(simulator):
+    device = HDFuryDevice(make_config(simulator))
+    assert not device.available
+    await device.connect()
+    try:
+        await wait_until(lambda: device.available)
+    finally:
+        await device.disconnect()
+    assert not device.available
+
+
+async def test_connect_reads_status_and_settings(device, simulator):
+    assert device.current_source == device.source_list[simulator.input]
+    assert device.get_sensor_value("video_input") == simulator.status["rx0"].split(":", 1)[1].strip()
+    assert device.get_sensor_value("sink_tx1") == simulator.status["tx1sink"].split(":", 1)[1].strip()
+    assert device.get_setting("edidmode") == simulator.settings["edidmode"]
+
+
+async def test_late_reply_and_prompt_are_not_charged_to_the_next_request(device, simulator):
+    simulator.profile.latency = 0.15
+    assert await device._send_command("get insel", timeout=0.05) is None
+    simulator.profile.latency = 0.002
+
+    assert await device._send_command("get status rx0") == simulator.status["rx0"]
+    assert await device._send_command("get insel") == f"insel {simulator.input}"
+
+
+async def test_late_reply_still_updates_state(device, simulator):
+    simulator.profile.latency = 0.15
+    simulator.input = 3
+    assert await device._send_command("get insel", timeout=0.05) is None
+    await wait_until(lambda: device.current_source == device.source_list[3])
+
+
+async def test_notification_is_not_taken_for_the_version(device, simulator):
+    simulator.profile.latency = 0.1
+    version = asyncio.create_task(device._send_command("get ver"))
+    await asyncio.sleep(0.02)
+    simulator.select_input(2)
+
+    assert await version == simulator.profile.version
+    assert device.current_source == device.source_list[2]
+
+
+async def test_notification_is_not_taken_for_a_set_reply_without_prompts(simulator):
+    simulator.profile.prompt = False
+    device = HDFuryDevice(make_config(simulator))
+    await device.connect()
+    try:
+        await wait_until(lambda: device.available)
+        pending = asyncio.create_task(device._send_command("set hotplug", timeout=0.3))
+        await asyncio.sleep(0.05)
+        simulator.select_input(2)
+        assert await pending == ""
+        await wait_until(lambda: device.current_source == device.source_list[2])
+    finally:
+        await device.disconnect()
+
+
+async def test_disconnect_right_after_a_set_returns(device):
+    assert await device._send_command("set hotplug") == ""
+    assert device._poll_wakeup.is_set()
+    async with asyncio.timeout(1.0):
+        await device.disconnect()
+    assert not device.available
+
+
+async def test_pipelined_batch_returns_replies_in_order(device, simulator):
+    commands = ["get status rx0", "get insel", "get edidmode", "get status tx0"]
+    replies = await device._send_batch(commands)
+    assert replies == [
+        simulator.status["rx0"],
+        f"insel {simulator.input}",
+        f"edidmode {simulator.settings['edidmode']}",
+        simulator.status["tx0"],
+    ]
+
+
+async def test_input_notification_updates_the_source(device, simulator):
+    simulator.select_input(2)
+    await wait_until(lambda: device.current_source == device.source_list[2])
+
+
+async def test_sequence_reaches_the_device_as_one_batch(device, simulator):
+    remote = HDFuryRemote(device.device_config, device)
+    simulator.profile.echo_sets = True
+    simulator.received.clear()
+    status = await remote._handle_command(
+        remote,
+        Commands.SEND_CMD_SEQUENCE,
+        {"sequence": ["set_source_HDMI_2", "set_edidmode_custom", "hotplug"]},
+    )
+    assert status == StatusCodes.OK
+    assert simulator.received[:3] == ["set inseltx0 2", "set edidmode custom", "set hotplug"]
+    assert simulator.input == 2
+    assert simulator.settings["edidmode"] == "custom"
+    assert device.get_setting("edidmode") == "custom"
+
+
+async def test_skip_mode_leaves_matching_settings_alone(simulator):
+    device = HDFuryDevice(make_config(simulator, skip_redundant_commands=True))
+    await device.connect()
+    try:
+        await wait_until(lambda: synced(device))
+        simulator.profile.echo_sets = True
+        simulator.received.clear()
+        current = simulator.settings["edidmode"]
+        assert await device.apply_settings([("edidmode", current), ("cec", "on")]) is None
+        assert [command for command in simulator.received if command.startswith("set ")] == [
+            "set cec on"
+        ]
+    finally:
+        await device.disconnect()
+
+
+async def test_skip_mode_rereads_settings_changed_on_the_device(simulator):
+    device = HDFuryDevice(make_config(simulator, skip_redundant_commands=True))
+    await device.connect()
+    try:
+        await wait_until(lambda: synced(device))
+        simulator.settings["edidmode"] = "custom"
+        device._settings_read_at -= SETTINGS_RECONCILE_INTERVAL
+        device._poll_wakeup.set()
+        await wait_until(lambda: device.get_setting("edidmode") == "custom")
+    finally:
+        await device.disconnect()
+
+
+async def test_latency_and_missed_replies_are_counted(device, simulator):
+    assert device.metrics.connects == 1
+    assert device.metrics.latency["get status"].count > 0
+
+    simulator.profile.drop_rate = 1.0
+    assert await device._send_command("get insel", timeout=0.05) is None
+    assert device.metrics.timeouts == {"get insel": 1}
+
+
+async def test_prompt_completes_a_silent_set(device, simulator):
+    start = asyncio.get_running_loop().time()
+    assert await device._send_command("set hotplug") == ""
+    assert asyncio.get_running_loop().time() - start < 1.0
+    assert "set hotplug" in simulator.received
+    assert await device._send_command("get insel") == f"insel {simulator.input}"
+
+
+async def test_notification_during_a_silent_set_is_applied(device, simulator):
+    simulator.profile.latency = 0.05
+    pending = asyncio.create_task(device._send_command("set hotplug"))
+    await asyncio.sleep(0.01)
+    simulator.select_input(3)
+    assert await pending == ""
+    await wait_until(lambda: device.current_source == device.source_list[3])
+
+
+async def test_reconnects_after_the_device_drops_the_connection(device, simulator):
+    connects = device.metrics.connects
+    states = []
+    device.push_update = lambda: states.append(device.available)
+    for task in list(simulator._handlers):
+        task.cancel()
+    await wait_until(lambda: device.metrics.connects > connects and device.available, timeout=1.0)
+    assert states[:2] == [False, True]
+    assert await device._send_command("get insel") == f"insel {simulator.input}"
+    assert simulator.received.count("get ver") == 2
+
+
+async def test_silent_link_is_closed_and_reopened(device, simulator):
+    connects = device.metrics.connects
+    simulator.profile.drop_rate = 1.0
+    for _ in range(MAX_MISSED_REPLIES):
+        assert await device._send_command("get insel", timeout=0.05) is None
+    simulator.profile.drop_rate = 0.0
+    await wait_until(lambda: device.metrics.connects > connects and device._connected())
+    assert device.metrics.stalled_closes == 1
+
+
+async def test_queued_settings_are_sent_once_on_connect(simulator):
+    device = HDFuryDevice(make_config(simulator))
+    await device.apply_setting("edidmode", "custom")
+    await device.apply_setting("edidmode", "automix")
+    await device.apply_setting("hdcp", "auto")
+    device._offline["hdcp"] = ("auto", device._offline["hdcp"][1] - OFFLINE_TTL - 1)
+
+    await device.connect()
+    try:
+        await wait_until(lambda: synced(device))
+        sets = [command for command in simulator.received if command.startswith("set ")]
+        assert sets == ["set edidmode automix"]
+        assert simulator.settings["edidmode"] == "automix"
+        assert device.get_setting("edidmode") == "automix"
+        assert not device._offline
+
+        # The initial sync reads every status; the flush must not trigger a second poll.
+        await wait_until(lambda: device._sync_task.done())
+        await asyncio.sleep(0.1)
+        assert simulator.received.count("get status rx0") == 1
+    finally:
+        await device.disconnect()
+
+
+class _Fleet:
+    """The parts of HDFuryDriver a device uses to coordinate with the rest of the rack."""
+
+    def __init__(self, slots: int):
+        self.connect_slots = asyncio.Semaphore(slots)
+        self.phases = iter((0.0, 0.5))
+
+    def next_poll_phase(self) -> float:
+        return next(self.phases)
+
+
+async def test_connects_wait_for_a_free_slot_and_polls_are_staggered(simulator):
+    fleet = _Fleet(slots=1)
+    first = HDFuryDevice(make_config(simulator), driver=fleet)
+    second = HDFuryDevice(make_config(simulator), driver=fleet)
+    assert (first._poll_phase, second._poll_phase) == (0.0, 0.5 * HEARTBEAT_INTERVAL)
+
+    async with fleet.connect_slots:
+        await first.connect()
+        await asyncio.sleep(0.05)
+        assert first._writer is None
+    try:
+        await wait_until(lambda: synced(first))
+    finally:
+        await first.disconnect()
+
+
+async def test_device_switches_to_the_model_it_reports():
+    async with HDFurySimulator(default_profile("dr8k")) as simulator:
+        config = make_config(simulator)
+        config.model_id = "vrroom"
+        device = HDFuryDevice(config)
+        await device.connect()
+        try:
+            await wait_until(lambda: device.get_sensor_value("video_input"))
+        finally:
+            await device.disconnect()
+    assert device.model_config.model_id == config.model_id == "dr8k"
+    assert not [command for command in simulator.received if command.startswith("get status tx")]
@@ -0,0 +1,140 @@
+"""Command metrics and the metrics endpoint."""
+
+import asyncio
+
+import pytest
+
+from uc_intg_hdfury.metrics import (
+    BATCH_STEP,
+    MIN_TIMEOUT,
+    DeviceMetrics,
+    Histogram,
+    ResponseTimeouts,
+    command_verb,
+    serve_metrics,
+)
+
+CEILING = 3.0
+
+
+def test_command_verb():
+    assert command_verb("get status rx0") == "get status"
+    assert command_verb("set edidmode automix") == "set edidmode"
+    assert command_verb("get ver") == "get ver"
+
+
+def test_unknown_verb_waits_the_full_ceiling():
+    assert ResponseTimeouts(CEILING).timeout("get insel") == CEILING
+
+
+def test_learned_timeout_is_per_verb_and_floored():
+    timeouts = ResponseTimeouts(CEILING)
+    for _ in range(20):
+        timeouts.observe("get status rx0", 0.002)
+    assert timeouts.timeout("get status tx0") == MIN_TIMEOUT
+    assert timeouts.timeout("get insel") == CEILING
+
+
+def test_slow_replies_raise_the_timeout():
+    timeouts = ResponseTimeouts(CEILING)
+    for _ in range(20):
+        timeouts.observe("get insel", 0.5)
+    assert 0.5 < timeouts.timeout("get insel") < CEILING
+
+
+def test_timeout_doubles_the_wait_that_expired():
+    timeouts = ResponseTimeouts(CEILING)
+    for _ in range(20):
+        timeouts.observe("get insel", 0.002)
+
+    timeouts.backoff("get insel", MIN_TIMEOUT)
+    assert timeouts.timeout("get insel") == pytest.approx(2 * MIN_TIMEOUT)
+    # Every request of a batch times out after the same wait: one doubling, not one each.
+    timeouts.backoff("get insel", MIN_TIMEOUT)
+    assert timeouts.timeout("get insel") == pytest.approx(2 * MIN_TIMEOUT)
+
+    timeouts.backoff("get insel", 2 * MIN_TIMEOUT)
+    assert timeouts.timeout("get insel") == pytest.approx(4 * MIN_TIMEOUT)
+    timeouts.backoff("get insel", CEILING)
+    assert timeouts.timeout("get insel") == CEILING
+
+
+def test_reply_in_time_ends_the_backoff():
+    timeouts = ResponseTimeouts(CEILING)
+    timeouts.observe("get insel", 0.002)
+    timeouts.backoff("get insel", 1.0)
+    timeouts.observe("get insel", 0.002)
+    assert timeouts.timeout("get insel") < 1.0
+
+
+def test_silent_verb_uses_the_overall_estimate():
+    timeouts = ResponseTimeouts(CEILING)
+    for _ in range(20):
+        timeouts.observe("get insel", 0.002)
+    timeouts.record_silent("set hotplug")
+    assert timeouts.timeout("set hotplug") == MIN_TIMEOUT
+
+
+def test_batch_timeout_allows_for_queued_replies():
+    timeouts = ResponseTimeouts(CEILING)
+    for _ in range(20):
+        timeouts.observe("get insel", 0.002)
+    commands = ["get insel"] * 5
+    assert timeouts.batch_timeout(commands) == pytest.approx(MIN_TIMEOUT + 4 * BATCH_STEP)
+    assert timeouts.batch_timeout(["get insel"] * 1000) == CEILING
+
+
+def test_histogram_quantiles_report_bucket_bounds():
+    histogram = Histogram((0.01, 0.1, 1.0))
+    for value in (0.005, 0.005, 0.05, 2.0):
+        histogram.observe(value)
+    assert histogram.count == 4
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.75) == 0.1
+    assert histogram.quantile(1.0) == 2.0
+    assert histogram.mean == pytest.approx(2.06 / 4)
+
+
+def test_only_later_connects_count_as_reconnects():
+    metrics = DeviceMetrics()
+    metrics.record_connect(False)
+    metrics.record_connect(True)
+    metrics.record_connect(True)
+    assert (metrics.connects, metrics.reconnects, metrics.connect_failures) == (2, 1, 1)
+
+
+def test_prometheus_lines_carry_the_device_and_verb():
+    metrics = DeviceMetrics()
+    metrics.observe_latency("get status rx0", 0.003)
+    metrics.record_timeout("get insel")
+    lines = metrics.prometheus_lines("rack1")
+    assert 'hdfury_command_timeouts_total{device="rack1",verb="get insel"} 1' in lines
+    assert 'hdfury_command_latency_seconds_count{device="rack1",verb="get status"} 1' in lines
+
+
+def test_retries_and_stalled_closes_are_exported():
+    metrics = DeviceMetrics()
+    metrics.record_retry("get cec")
+    metrics.record_stalled_close()
+    lines = metrics.prometheus_lines("rack1")
+    assert 'hdfury_command_retries_total{device="rack1",verb="get cec"} 1' in lines
+    assert 'hdfury_stalled_closes_total{device="rack1"} 1' in lines
+    assert metrics.snapshot()["retries"] == {"get cec": 1}
+
+
+async def test_metrics_are_served_over_http():
+    metrics = DeviceMetrics()
+    metrics.record_connect(True)
+    server = await serve_metrics(0, lambda: [("rack1", metrics)])
+    assert server.sockets[0].getsockname()[0] == "127.0.0.1"
+    try:
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert 'hdfury_connects_total{device="rack1"} 1' in response
@@ -0,0 +1,83 @@
+"""Per-model status queries, select options, sensor state and model identification."""
+
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.simulator import default_profile
+from uc_intg_hdfury.models import (
+    MODEL_CONFIGS,
+    SensorState,
+    get_setting_names,
+    get_status_queries,
+    identify_model,
+    without_settings,
+)
+
+
+def test_status_queries_are_expanded_per_output():
+    queries = {query.command: query for query in get_status_queries(MODEL_CONFIGS["vrroom"])}
+    assert {"get status tx0", "get status tx1", "get status tx1sink"} <= set(queries)
+    assert queries["get status aud1"].prefix == "AUD1:"
+    assert queries["get status aud1"].fallback_key == "audio_mode_tx1"
+
+
+def test_models_without_outputs_skip_the_output_queries():
+    commands = [query.command for query in get_status_queries(MODEL_CONFIGS["diva"])]
+    assert commands[:3] == ["get insel", "get status rx0", "get status audout"]
+    assert not any("tx" in command for command in commands)
+
+
+def test_input_query_needs_inputs():
+    model = replace(MODEL_CONFIGS["diva"], input_count=0)
+    assert "get insel" not in [query.command for query in get_status_queries(model)]
+
+
+def test_select_options_are_computed_once_per_model():
+    model = MODEL_CONFIGS["vrroom"]
+    labels, values = model.select_options["edidmode"]
+    assert labels[values.index("automix")] == "Automix"
+    assert model.select_labels["edidmode"]["automix"] == "Automix"
+    assert "scale" not in model.select_options
+
+
+def test_sensor_state_has_a_fixed_field_per_sensor():
+    state = SensorState()
+    state.video_tx1 = "4K60"
+    assert state.get("video_tx1") == "4K60"
+    assert state.get("unknown") is None
+    with pytest.raises(AttributeError):
+        state.unknown = "value"
+
+
+@pytest.mark.parametrize("model_id", list(MODEL_CONFIGS))
+def test_identifies_every_model_from_its_version(model_id):
+    assert identify_model(default_profile(model_id).version).model_id == model_id
+
+
+@pytest.mark.parametrize(
+    ("version", "model_id"),
+    [
+        ("VRROOM-50 FW 0.63", "vrroom"),
+        ("vertex2 fw:0.12", "vertex2"),
+        ("VERTEX FW 0.20", "vertex"),
+        ("ARCANA FW 1.0", "arcana2"),
+        ("DR.HDMI-8K 0.63", "dr8k"),
+    ],
+)
+def test_identifies_version_variants(version, model_id):
+    assert identify_model(version).model_id == model_id
+
+
+@pytest.mark.parametrize("version", ["", "insel 2", "FW 0.63", "SOMETHING ELSE"])
+def test_unknown_version_is_not_identified(version):
+    assert identify_model(version) is None
+
+
+def test_without_settings_drops_them_and_their_options():
+    model = MODEL_CONFIGS["vrroom"]
+    pruned = without_settings(model, ["cec", "edidmode"])
+    assert set(get_setting_names(model)) - set(get_setting_names(pruned)) == {"cec", "edidmode"}
+    assert "edidmode" not in pruned.select_options
+    assert pruned.model_id == model.model_id
+    assert without_settings(model, []) is model
@@ -0,0 +1,24 @@
+"""Package import cost and metadata."""
+
+import json
+import subprocess
+import sys
+
+import uc_intg_hdfury
+
+
+def test_import_does_not_load_the_driver_stack():
+    probe = (
+        "import sys, uc_intg_hdfury; "
+        "print(sorted(m for m in ('ucapi', 'ucapi_framework', 'uc_intg_hdfury.driver') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_version_comes_from_driver_json():
+    with open(uc_intg_hdfury.DRIVER_JSON, encoding="utf-8") as f:
+        assert uc_intg_hdfury.__version__ == json.load(f)["version"]
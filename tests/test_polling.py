@@ -0,0 +1,79 @@
+"""Adaptive poll scheduling."""
+
+from uc_intg_hdfury.polling import BOOST_CYCLES, DEFAULT_INTERVAL, MAX_BACKOFF, PollScheduler
+
+
+def test_new_fields_are_due_at_once():
+    scheduler = PollScheduler({"get insel": 10.0})
+    assert scheduler.due(["get insel", "get status rx0"], 0.0) == ["get insel", "get status rx0"]
+
+
+def test_unchanged_value_backs_off_up_to_the_limit():
+    scheduler = PollScheduler({"get insel": 10.0})
+    now = 0.0
+    for expected in (10.0, 20.0, 40.0, 10.0 * MAX_BACKOFF, 10.0 * MAX_BACKOFF):
+        scheduler.record("get insel", "insel 1", now)
+        assert scheduler.due(["get insel"], now + expected - 0.1) == []
+        assert scheduler.due(["get insel"], now + expected) == ["get insel"]
+        now += expected
+
+
+def test_changed_or_missing_value_resets_the_interval():
+    scheduler = PollScheduler({"get insel": 10.0})
+    scheduler.record("get insel", "insel 1", 0.0)
+    scheduler.record("get insel", "insel 1", 10.0)
+    scheduler.record("get insel", "insel 2", 30.0)
+    assert scheduler.due(["get insel"], 40.0) == ["get insel"]
+    scheduler.record("get insel", None, 40.0)
+    assert scheduler.due(["get insel"], 50.0) == ["get insel"]
+
+
+def test_slowed_down_field_waits_for_its_floor():
+    scheduler = PollScheduler({"get insel": 10.0, "get status rx0": 10.0})
+    scheduler.slow_down("get insel", 120.0)
+    scheduler.record("get insel", "insel 1", 0.0)
+    scheduler.record("get status rx0", "RX0: 4K60", 0.0)
+    commands = ["get insel", "get status rx0"]
+    assert scheduler.due(commands, 100.0) == ["get status rx0"]
+    assert scheduler.due(commands, 120.0) == commands
+
+
+def test_boost_polls_fast_fields_for_a_few_ticks():
+    scheduler = PollScheduler({"get insel": 10.0, "get status tx0sink": 120.0})
+    commands = ["get insel", "get status tx0sink"]
+    for command in commands:
+        scheduler.record(command, "value", 0.0)
+
+    scheduler.boost()
+    for _ in range(BOOST_CYCLES):
+        assert scheduler.boosted
+        assert scheduler.due(commands, 1.0) == ["get insel"]
+    assert not scheduler.boosted
+    assert scheduler.due(commands, 1.0) == []
+
+
+def test_replan_keeps_rate_limit_boost_and_unchanged_fields():
+    scheduler = PollScheduler({"get insel": 10.0, "get cec": DEFAULT_INTERVAL})
+    scheduler.slow_down("get insel", 120.0)
+    scheduler.record("get insel", "insel 1", 0.0)
+    scheduler.record("get cec", "cec on", 0.0)
+    scheduler.boost()
+
+    scheduler.replan({"get insel": 10.0})
+    assert scheduler.boosted
+    assert scheduler.due(["get insel"], 1.0) == ["get insel"]
+    scheduler._boost_remaining = 0
+    scheduler.record("get insel", "insel 1", 1.0)
+    assert scheduler.due(["get insel"], 100.0) == []
+
+
+def test_reset_forgets_everything():
+    scheduler = PollScheduler({"get insel": 10.0})
+    scheduler.slow_down("get insel", 120.0)
+    scheduler.record("get insel", "insel 1", 0.0)
+    scheduler.boost()
+    scheduler.reset()
+    assert not scheduler.boosted
+    assert scheduler.due(["get insel"], 0.0) == ["get insel"]
+    scheduler.record("get insel", "insel 2", 0.0)
+    assert scheduler.due(["get insel"], 10.0) == ["get insel"]
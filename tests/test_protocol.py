@@ -0,0 +1,135 @@
+"""Reply framing and matching of replies to pending requests."""
+
+from collections import deque
+
+import pytest
+
+from uc_intg_hdfury.device import (
+    PROMPT,
+    _match_pending,
+    _no_reply,
+    _Request,
+    _response_prefix,
+    _split_frames,
+    _split_status_line,
+    _starts_with_keyword,
+)
+
+
+def _pending(*commands: str, timed_out: tuple[int, ...] = ()) -> deque[_Request]:
+    return deque(
+        _Request(command, _response_prefix(command), None, timed_out=index in timed_out)
+        for index, command in enumerate(commands)
+    )
+
+
+def _match(line: str, *commands: str, framed: bool = False, notification: bool = False) -> int | None:
+    return _match_pending(line, _pending(*commands), framed, notification)
+
+
+@pytest.mark.parametrize(
+    ("buffer", "frames", "rest"),
+    [
+        ("insel 1\r\n>", ["insel 1", PROMPT], ""),
+        ("edidmode automix>", ["edidmode automix", PROMPT], ""),
+        (">>", [PROMPT, PROMPT], ""),
+        ("\r\n\r\n>", [PROMPT], ""),
+        ("RX0: 4K60\r\nTX0: 4K", ["RX0: 4K60"], "TX0: 4K"),
+        ("", [], ""),
+    ],
+)
+def test_split_frames(buffer, frames, rest):
+    assert _split_frames(buffer) == (frames, rest)
+
+
+def test_split_frames_across_reads():
+    frames, rest = _split_frames("ins")
+    assert frames == []
+    frames, rest = _split_frames(rest + "el 1\r\n>")
+    assert (frames, rest) == (["insel 1", PROMPT], "")
+
+
+@pytest.mark.parametrize(
+    ("command", "prefix"),
+    [
+        ("get status rx0", "RX0:"),
+        ("get insel", "insel"),
+        ("set edidmode automix", "edidmode"),
+        ("get ver", None),
+        ("reboot", None),
+    ],
+)
+def test_response_prefix(command, prefix):
+    assert _response_prefix(command) == prefix
+
+
+@pytest.mark.parametrize(
+    ("line", "split"),
+    [
+        ("RX0: 4K60 444 10b", ("RX0:", "4K60 444 10b")),
+        ("insel 2", ("insel", "2")),
+        ("audiomodetx0 auto", ("audiomodetx0", "auto")),
+        ("", ("", "")),
+    ],
+)
+def test_split_status_line(line, split):
+    assert _split_status_line(line) == split
+
+
+@pytest.mark.parametrize(
+    ("line", "prefix", "matches"),
+    [
+        ("insel 2", "insel", True),
+        ("INSEL:2", "insel", True),
+        ("insel", "insel", True),
+        ("inseltx0 2", "insel", False),
+        ("hdcpmode auto", "hdcp", False),
+        ("RX0: 4K60", "RX0:", True),
+        ("rx0:4K60", "RX0:", True),
+        ("RX01: 4K60", "RX0:", False),
+    ],
+)
+def test_starts_with_keyword(line, prefix, matches):
+    assert _starts_with_keyword(line, prefix) is matches
+
+
+def test_reply_matches_request_by_prefix():
+    assert _match("rx0: 4K60", "get insel", "get status rx0") == 1
+    assert _match("insel 1", "get insel", "get status rx0") == 0
+
+
+def test_longer_keyword_does_not_answer_a_shorter_prefix():
+    assert _match("inseltx0 2", "get insel") is None
+
+
+def test_unmatched_line_with_prefixed_head_is_discarded():
+    assert _match("TX0: 1080p", "get insel") is None
+
+
+def test_prefixless_request_takes_unmatched_line():
+    assert _match("VRROOM FW 0.63", "get ver") == 0
+
+
+def test_notification_never_answers_prefixless_request():
+    assert _match("insel 2", "get ver", notification=True) is None
+    assert _match("insel 2", "set hotplug", notification=True) is None
+
+
+def test_silent_set_takes_unmatched_line_only_without_prompts():
+    assert _match("OK", "set hotplug") == 0
+    assert _match("OK", "set hotplug", framed=True) is None
+
+
+def test_timed_out_request_absorbs_its_late_reply_first():
+    pending = _pending("get insel", "get insel", timed_out=(0,))
+    assert _match_pending("insel 2", pending) == 0
+
+
+def test_timed_out_request_does_not_hide_later_prefixless_request():
+    pending = _pending("get insel", "get ver", timed_out=(0,))
+    assert _match_pending("VRROOM FW 0.63", pending) == 1
+
+
+def test_no_reply():
+    assert _no_reply("set hotplug") == ""
+    assert _no_reply("get insel") is None
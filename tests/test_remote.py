@@ -0,0 +1,67 @@
+"""Remote entity command dispatch."""
+
+from conftest import SentCommands, make_device, record_commands
+from ucapi import StatusCodes
+from ucapi.remote import Commands
+
+from uc_intg_hdfury.remote import HDFuryRemote
+
+
+def make_remote(model_id: str = "vrroom", **kwargs) -> tuple[HDFuryRemote, SentCommands]:
+    device = make_device(model_id)
+    sent = record_commands(device, **kwargs)
+    return HDFuryRemote(device.device_config, device), sent
+
+
+async def test_ui_pages_only_use_known_commands():
+    remote, _ = make_remote()
+    page_commands = {
+        item["command"]["cmd_id"]
+        for page in remote.options["user_interface"]["pages"]
+        for item in page["items"]
+        if item.get("command")
+    }
+    assert page_commands
+    assert page_commands <= set(remote._commands)
+
+
+async def test_command_is_sent_to_the_device():
+    remote, sent = make_remote()
+    status = await remote._handle_command(remote, Commands.SEND_CMD, {"command": "set_cec_on"})
+    assert status == StatusCodes.OK
+    assert sent == ["set cec on"]
+
+
+async def test_unknown_command_is_rejected_before_sending():
+    remote, sent = make_remote()
+    status = await remote._handle_command(remote, Commands.SEND_CMD, {"command": "set_bogus"})
+    assert status == StatusCodes.BAD_REQUEST
+    assert await remote._handle_command(remote, Commands.SEND_CMD, {}) == StatusCodes.BAD_REQUEST
+    assert not sent
+
+
+async def test_sequence_with_an_unknown_step_sends_nothing():
+    remote, sent = make_remote()
+    status = await remote._handle_command(
+        remote, Commands.SEND_CMD_SEQUENCE, {"sequence": ["set_cec_on", "set_bogus"]}
+    )
+    assert status == StatusCodes.BAD_REQUEST
+    assert not sent
+
+
+async def test_sequence_is_sent_as_one_batch():
+    remote, sent = make_remote()
+    status = await remote._handle_command(
+        remote, Commands.SEND_CMD_SEQUENCE, {"sequence": ["set_cec_on", "set_edidmode_automix"]}
+    )
+    assert status == StatusCodes.OK
+    assert sent.batches == [["set cec on", "set edidmode automix"]]
+
+
+async def test_sequence_with_an_unanswered_step_fails():
+    remote, sent = make_remote(failing=("set cec on",))
+    status = await remote._handle_command(
+        remote, Commands.SEND_CMD_SEQUENCE, {"sequence": ["set_edidmode_automix", "set_cec_on"]}
+    )
+    assert status == StatusCodes.SERVER_ERROR
+    assert sent.batches == [["set edidmode automix", "set cec on"]]
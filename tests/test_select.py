@@ -0,0 +1,85 @@
+"""Select entities and the device settings cache behind them."""
+
+import asyncio
+
+from conftest import make_device, record_commands
+from ucapi import StatusCodes
+from ucapi.select import Commands
+
+from uc_intg_hdfury.select_entities import create_select_entities
+
+
+def make_selects(model_id: str = "vrroom"):
+    device = make_device(model_id)
+    sent = record_commands(device)
+    selects = {
+        entity.id.rsplit(".", 1)[1]: entity
+        for entity in create_select_entities(device.device_config, device)
+    }
+    return device, selects, sent
+
+
+async def test_current_option_follows_the_cached_setting():
+    device, selects, _ = make_selects()
+    assert selects["edid"]._current_option() is None
+    device._apply_setting_line("edidmode automix")
+    assert selects["edid"]._current_option() == "Automix"
+    device._apply_setting_line("hdcp 1.4")
+    assert selects["hdcp"]._current_option() == "1.4"
+
+
+async def test_selecting_an_option_sends_it_and_updates_the_cache():
+    device, selects, sent = make_selects()
+    status = await selects["edid"]._handle_command(
+        selects["edid"], Commands.SELECT_OPTION, {"option": "Custom"}
+    )
+    assert status == StatusCodes.OK
+    assert sent == ["set edidmode custom"]
+    assert device.get_setting("edidmode") == "custom"
+    assert selects["edid"]._current_option() == "Custom"
+
+
+async def test_options_are_shared_from_the_model():
+    device, selects, _ = make_selects()
+    labels, values = device.model_config.select_options["hdcp"]
+    assert selects["hdcp"]._options is labels
+    assert "1.4" in labels and "1.4" in values
+    assert make_selects()[1]["edid"]._options is selects["edid"]._options
+
+
+async def test_option_that_is_not_offered_is_rejected():
+    _, selects, sent = make_selects()
+    status = await selects["edid"]._handle_command(
+        selects["edid"], Commands.SELECT_OPTION, {"option": "automix"}
+    )
+    assert status == StatusCodes.BAD_REQUEST
+    assert not sent
+
+
+async def test_input_select_follows_the_current_source():
+    device, selects, _ = make_selects()
+    device._apply_status_line("insel 1")
+    assert selects["input"]._current_option() == device.source_list[1]
+
+
+async def test_settings_are_read_in_one_batch():
+    device, _, sent = make_selects()
+    sent.reply = "edidmode fixed"
+    await device._read_settings()
+    assert len(sent.batches) == 1
+    assert "get edidmode" in sent and "get cec" in sent
+    assert device.get_setting("edidmode") == "fixed"
+
+
+async def test_setting_notification_updates_the_cache():
+    device = make_device()
+    changed = []
+
+    async def handler():
+        changed.append(device.get_setting("cec"))
+
+    device.subscribe_setting("cec", handler)
+    device._dispatch_line("cec off")
+    await asyncio.sleep(0.01)
+    assert changed == ["off"]
+    assert not device._pushed
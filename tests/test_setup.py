@@ -0,0 +1,29 @@
+"""Setup flow against simulated devices."""
+
+import pytest
+from ucapi_framework import BaseConfigManager
+
+from benchmarks.simulator import HDFurySimulator, default_profile
+from uc_intg_hdfury.config import HDFuryConfig
+from uc_intg_hdfury.setup_flow import HDFurySetupFlow
+
+
+@pytest.fixture
+def setup_flow(tmp_path):
+    return HDFurySetupFlow(BaseConfigManager(str(tmp_path), config_class=HDFuryConfig), driver=None)
+
+
+async def test_setup_uses_the_model_the_device_reports(setup_flow):
+    async with HDFurySimulator(default_profile("dr8k")) as simulator:
+        config = await setup_flow.query_device(
+            {"model": "vertex", "address": simulator.host, "port": simulator.port}
+        )
+    assert config.model_id == "dr8k"
+    assert config.name == "HDFury Dr.HDMI 8K"
+
+
+async def test_setup_fails_when_nothing_answers(setup_flow):
+    async with HDFurySimulator(default_profile("vrroom")) as simulator:
+        port = simulator.port
+    with pytest.raises(ValueError):
+        await setup_flow.query_device({"model": "vrroom", "address": "127.0.0.1", "port": port})
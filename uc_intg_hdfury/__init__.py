@@ -9,23 +9,34 @@ import asyncio
 import json
 import logging
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
 
-from ucapi import DeviceStates
-from ucapi_framework import BaseConfigManager, get_config_path
+_STARTED = time.perf_counter()
+_LOG = logging.getLogger(__name__)
 
-from uc_intg_hdfury.config import HDFuryConfig
-from uc_intg_hdfury.driver import HDFuryDriver
-from uc_intg_hdfury.setup_flow import HDFurySetupFlow
+DRIVER_JSON = Path(__file__).parent.parent.absolute() / "driver.json"
 
-try:
-    driver_path = Path(__file__).parent.parent.absolute() / "driver.json"
-    with open(driver_path, "r", encoding="utf-8") as f:
-        __version__ = json.load(f).get("version", "0.0.0")
-except (FileNotFoundError, json.JSONDecodeError):
-    __version__ = "0.0.0"
 
-_LOG = logging.getLogger(__name__)
+@lru_cache(maxsize=None)
+def _driver_info() -> dict:
+    """Return the parsed ``driver.json``, read once on first use."""
+    try:
+        with open(DRIVER_JSON, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        return _driver_info().get("version", "0.0.0")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _elapsed_ms(since: float) -> float:
+    return (time.perf_counter() - since) * 1000
 
 
 async def main():
@@ -35,7 +46,19 @@ async def main():
         format="%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s",
     )
 
-    _LOG.info("Starting HDFury Integration v%s", __version__)
+    _LOG.info("Starting HDFury Integration v%s", _driver_info().get("version", "0.0.0"))
+
+    # The API and driver stack is the bulk of the start-up cost; import it only when running.
+    imports_started = time.perf_counter()
+    from ucapi import DeviceStates
+    from ucapi_framework import BaseConfigManager, get_config_path
+
+    from uc_intg_hdfury.config import HDFuryConfig
+    from uc_intg_hdfury.discovery import HDFuryDiscovery
+    from uc_intg_hdfury.driver import HDFuryDriver
+    from uc_intg_hdfury.setup_flow import HDFurySetupFlow
+
+    import_ms = _elapsed_ms(imports_started)
 
     driver = HDFuryDriver()
 
@@ -48,21 +71,39 @@ async def main():
     )
     driver.config_manager = config_manager
 
-    setup_handler = HDFurySetupFlow.create_handler(driver)
-    driver_json_path = os.path.join(os.path.dirname(__file__), "..", "driver.json")
-    await driver.api.init(os.path.abspath(driver_json_path), setup_handler)
+    setup_handler = HDFurySetupFlow.create_handler(driver, discovery=HDFuryDiscovery())
+    init_started = time.perf_counter()
+    await driver.api.init(str(DRIVER_JSON), setup_handler)
+    init_ms = _elapsed_ms(init_started)
 
-    await driver.register_all_device_instances(connect=False)
+    # Entities are built from the static model config and start unavailable; devices connect
+    # in the background, so a slow or dead box does not hold up the rest.
+    await driver.register_all_device_instances(connect=True)
 
     device_count = len(list(config_manager.all()))
     if device_count > 0:
         await driver.api.set_device_state(DeviceStates.CONNECTED)
     else:
         await driver.api.set_device_state(DeviceStates.DISCONNECTED)
+    _LOG.info(
+        "Startup: %.0f ms to device state (imports %.0f ms, API init %.0f ms)",
+        _elapsed_ms(_STARTED),
+        import_ms,
+        init_ms,
+    )
+
+    metrics_port = os.getenv("UC_HDFURY_METRICS_PORT")
+    if metrics_port:
+        await driver.start_metrics_server(
+            int(metrics_port), os.getenv("UC_HDFURY_METRICS_HOST", "127.0.0.1")
+        )
 
     _LOG.info("HDFury integration started")
 
-    await asyncio.Future()
+    try:
+        await asyncio.Future()
+    finally:
+        await driver.stop_metrics_server()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ HDFury configuration for Unfolded Circle integration.
 :license: MPL-2.0, see LICENSE for more details.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -17,3 +17,10 @@ class HDFuryConfig:
     address: str
     port: int
     model_id: str = "vrroom"
+    skip_redundant_commands: bool = False
+    diagnostic_sensors: bool = False
+    # ``get`` queries the device never answered, and the firmware they were probed on.
+    unsupported_queries: list[str] = field(default_factory=list)
+    # Connections on which a query still went unanswered, until it counts as unsupported.
+    query_misses: dict[str, int] = field(default_factory=dict)
+    probed_firmware: str = ""
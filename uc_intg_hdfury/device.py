@@ -6,17 +6,174 @@ HDFury device implementation.
 """
 
 import asyncio
+import contextlib
 import logging
+import random
+import re
+import socket
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 
 from ucapi_framework import PersistentConnectionDevice
 
 from uc_intg_hdfury.config import HDFuryConfig
-from uc_intg_hdfury.models import ModelConfig, get_model_config, get_source_list
+from uc_intg_hdfury.metrics import DeviceMetrics, ResponseTimeouts
+from uc_intg_hdfury.models import (
+    MODEL_CONFIGS,
+    ModelConfig,
+    SensorState,
+    StatusQuery,
+    format_source_for_command,
+    get_model_config,
+    get_setting_names,
+    get_source_list,
+    get_status_queries,
+    identify_model,
+    without_settings,
+)
+from uc_intg_hdfury.polling import PollScheduler
 
 _LOG = logging.getLogger(__name__)
 
 RESPONSE_TIMEOUT = 3.0
-HEARTBEAT_INTERVAL = 20
+LATE_REPLY_WINDOW = 2 * RESPONSE_TIMEOUT
+CONNECT_TIMEOUT = 3.0
+HEARTBEAT_INTERVAL = 10
+MAX_MISSED_REPLIES = 3
+PROBE_CONNECTIONS = 3
+RECONNECT_BASE = 0.1
+RECONNECT_MAX = 5.0
+KEEPALIVE_IDLE = 5
+KEEPALIVE_INTERVAL = 2
+KEEPALIVE_COUNT = 3
+RECONCILE_INTERVAL = 120
+SETTINGS_RECONCILE_INTERVAL = 60
+# Skip mode trusts a cached setting only if the device confirmed it within this long.
+SKIP_FRESHNESS = 2 * SETTINGS_RECONCILE_INTERVAL
+POLL_TICK = 5.0
+BOOST_TICK = 1.0
+BACKGROUND_WINDOW = 3
+OFFLINE_QUEUE_SIZE = 32
+OFFLINE_TTL = 30.0
+NOT_QUEUED = frozenset({"reboot"})
+SENSOR_EVENT = "sensor_update"
+SETTING_EVENT = "setting_update"
+READ_CHUNK = 4096
+PROMPT = ">"
+
+_FRAME = re.compile(r"([^\n>]*)([\n>])")
+
+
+def _split_frames(buffer: str) -> tuple[list[str], str]:
+    """Split *buffer* into reply lines and prompts, returning them and the unterminated rest."""
+    frames = []
+    end = 0
+    for match in _FRAME.finditer(buffer):
+        text = match.group(1).strip()
+        if text:
+            frames.append(text)
+        if match.group(2) == PROMPT:
+            frames.append(PROMPT)
+        end = match.end()
+    return frames, buffer[end:]
+
+
+def _split_status_line(line: str) -> tuple[str, str]:
+    """Split a status line into its keyword and value, e.g. ``RX0:`` or ``insel``."""
+    head, sep, rest = line.partition(":")
+    if sep and " " not in head.strip():
+        return f"{head.strip()}:", rest.strip()
+    parts = line.split(None, 1)
+    return (parts[0] if parts else ""), (parts[1].strip() if len(parts) > 1 else "")
+
+
+def _response_prefix(command: str) -> str | None:
+    """Return the keyword the device echoes at the start of its reply to *command*."""
+    parts = command.split()
+    if len(parts) < 2 or parts[1] == "ver":
+        return None
+    if parts[0] == "get" and parts[1] == "status" and len(parts) >= 3:
+        return f"{parts[2].upper()}:"
+    return parts[1]
+
+
+def _starts_with_keyword(line: str, prefix: str) -> bool:
+    """Return True if *line* opens with the keyword *prefix*, ignoring case.
+
+    ``insel`` matches ``insel 2`` and ``insel:2`` but not ``inseltx0 2``; a prefix that ends
+    in a colon, such as ``RX0:``, is a whole keyword by itself.
+    """
+    if line[: len(prefix)].lower() != prefix.lower():
+        return False
+    rest = line[len(prefix):]
+    return prefix.endswith(":") or not rest or rest[0] == ":" or rest[0].isspace()
+
+
+@dataclass
+class _Request:
+    """A command written to the device that is still waiting for its reply."""
+
+    command: str
+    prefix: str | None
+    future: asyncio.Future
+    sent_at: float = 0.0
+    # Given up on, but the device may still send its reply and prompt.
+    timed_out: bool = False
+
+
+def _match_pending(
+    line: str, pending: deque[_Request], framed: bool = False, notification: bool = False
+) -> int | None:
+    """Return the index of the pending request *line* answers, or None if none.
+
+    Once the device is known to print prompts (*framed*), a silent set is completed by its
+    prompt, so unmatched lines are treated as notifications instead of its reply. A line that
+    reads as a status or setting *notification* only ever answers a request by its prefix.
+    """
+    for index, request in enumerate(pending):
+        if request.prefix and _starts_with_keyword(line, request.prefix):
+            return index
+    if notification:
+        return None
+
+    for index, request in enumerate(pending):
+        if request.timed_out and request.prefix:
+            continue
+        if request.prefix is None or (request.command.startswith("set ") and not framed):
+            return index
+        return None
+    return None
+
+
+def _no_reply(command: str) -> str | None:
+    """Result for a request the device did not answer; silent sets count as success."""
+    return "" if command.startswith("set ") else None
+
+
+def _on_off(enabled: bool) -> str:
+    return "on" if enabled else "off"
+
+
+def _enable_keepalive(writer: asyncio.StreamWriter) -> None:
+    """Let the kernel notice a dead peer within seconds instead of hours."""
+    sock = writer.get_extra_info("socket")
+    if sock is None:
+        return
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (
+        ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+        ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+        ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+        ("TCP_USER_TIMEOUT", (KEEPALIVE_IDLE + KEEPALIVE_INTERVAL * KEEPALIVE_COUNT) * 1000),
+    ):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    for level, option, value in options:
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError:
+            pass
 
 
 class HDFuryDevice(PersistentConnectionDevice):
@@ -28,13 +185,122 @@ class HDFuryDevice(PersistentConnectionDevice):
         self._reader: asyncio.StreamReader | None = None
         self._writer: asyncio.StreamWriter | None = None
         self._lock = asyncio.Lock()
-
-        self.model_config: ModelConfig = get_model_config(device_config.model_id)
-        self.source_list: list[str] = get_source_list(self.model_config)
-
-        self._state = "ON"
+        self._reader_task: asyncio.Task | None = None
+        self._sync_task: asyncio.Task | None = None
+        self._pending: deque[_Request] = deque()
+
+        if device_config.model_id not in MODEL_CONFIGS:
+            _LOG.warning(
+                "[%s] Unknown model %r, assuming VRRooM until the device identifies itself",
+                device_config.name,
+                device_config.model_id,
+            )
+        self._unsupported: set[str] = set(device_config.unsupported_queries)
+        self._set_model(get_model_config(device_config.model_id))
+
+        self._state = "UNAVAILABLE"
         self._current_source: str | None = None
-        self._sensor_values: dict[str, str] = {}
+        self._sensor_values = SensorState()
+        self._raw_status = SensorState()
+        self._settings: dict[str, str] = {}
+        # When the device last confirmed each cached setting (and "source"), by loop time.
+        self._confirmed: dict[str, float] = {}
+        self._settings_read_at = 0.0
+        self._changed_events: set[str] = set()
+        # Status queries whose changes the device pushes, and so are only polled to reconcile.
+        self._pushed: set[str] = set()
+        # Prefixes of requests given up on recently, whose replies may still trickle in.
+        self._unanswered: dict[str, float] = {}
+        self._poll_wakeup = asyncio.Event()
+        self._last_reply = 0.0
+        self.metrics = DeviceMetrics()
+        self._timeouts = ResponseTimeouts(RESPONSE_TIMEOUT)
+        self._reply_since_prompt = False
+        self._prompt_seen = False
+        self._missed_replies = 0
+        self._connect_failures = 0
+        self.firmware: str | None = None
+        self._offline: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._interactive = 0
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+        next_phase = getattr(self.driver, "next_poll_phase", None)
+        self._poll_phase = next_phase() * HEARTBEAT_INTERVAL if next_phase else 0.0
+
+    def _set_model(self, model_config: ModelConfig) -> None:
+        """Derive the poll plan, source list and setting keywords from *model_config*.
+
+        Settings and status queries the device is known not to answer are left out, which also
+        drops their commands and entities.
+        """
+        self.model_config = model_config
+        missing = [
+            setting
+            for setting in get_setting_names(model_config)
+            if f"get {self._setting_keyword(setting)}" in self._unsupported
+        ]
+        self.model_config = model_config = without_settings(model_config, missing)
+        self.source_list: list[str] = get_source_list(model_config)
+        self._status_queries: list[StatusQuery] = [
+            query
+            for query in get_status_queries(model_config)
+            if query.command not in self._unsupported
+        ]
+        self._queries_by_prefix = {query.prefix.lower(): query for query in self._status_queries}
+        # Input changes are also reported under the source command, e.g. ``inseltx0 2``.
+        if model_config.source_command and "insel" in self._queries_by_prefix:
+            self._queries_by_prefix.setdefault(
+                model_config.source_command.lower(), self._queries_by_prefix["insel"]
+            )
+        self._fallback_dependents: dict[str, list[StatusQuery]] = {}
+        for query in self._status_queries:
+            if query.fallback_key:
+                self._fallback_dependents.setdefault(query.fallback_key, []).append(query)
+        self._setting_keywords = {
+            self._setting_keyword(setting): setting for setting in get_setting_names(model_config)
+        }
+        intervals = {query.command: query.interval for query in self._status_queries}
+        # Replanning keeps the reduced rate of push mode and any boost in progress.
+        if hasattr(self, "_poll_scheduler"):
+            self._poll_scheduler.replan(intervals)
+        else:
+            self._poll_scheduler = PollScheduler(intervals)
+
+    def _check_model(self, version: str) -> None:
+        """Adopt the model named in the version reply when it differs from the configured one.
+
+        A new model or firmware also forgets which queries went unanswered, so they are probed
+        again.
+        """
+        detected = identify_model(version)
+        if detected is not None and detected.model_id != self.model_config.model_id:
+            _LOG.warning(
+                "%s Configured as %s but the device reports %r, switching to %s",
+                self.log_id,
+                self.model_config.display_name,
+                version,
+                detected.display_name,
+            )
+            self._reset_model(detected, model_id=detected.model_id)
+        elif (
+            self._unsupported or self._config.query_misses
+        ) and version != self._config.probed_firmware:
+            _LOG.info("%s Firmware changed to %r, probing all queries again", self.log_id, version)
+            self._reset_model(get_model_config(self.model_config.model_id))
+
+    def _reset_model(self, model_config: ModelConfig, **changes) -> None:
+        self._unsupported.clear()
+        self._set_model(model_config)
+        self._settings.clear()
+        self.update_config(
+            unsupported_queries=[], query_misses={}, probed_firmware="", **changes
+        )
+        self._refresh_entities()
+
+    def _refresh_entities(self) -> None:
+        refresh = getattr(self.driver, "refresh_available_entities", None)
+        if refresh:
+            refresh(self._config, self)
 
     @property
     def identifier(self) -> str:
@@ -56,21 +322,40 @@ class HDFuryDevice(PersistentConnectionDevice):
     def current_source(self) -> str | None:
         return self._current_source
 
+    @property
+    def available(self) -> bool:
+        return self._state == "ON"
+
     async def establish_connection(self):
         await self._close_tcp()
 
         _LOG.info("%s Connecting to %s:%d", self.log_id, self._config.address, self._config.port)
 
-        self._reader, self._writer = await asyncio.wait_for(
-            asyncio.open_connection(self._config.address, self._config.port),
-            timeout=10.0,
-        )
-
-        await self._drain_buffer()
-
-        version = await self._send_command("get ver")
-        if version:
-            _LOG.info("%s Connected, firmware: %s", self.log_id, version)
+        async with getattr(self.driver, "connect_slots", None) or contextlib.nullcontext():
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._config.address, self._config.port),
+                    timeout=CONNECT_TIMEOUT,
+                )
+            except (asyncio.TimeoutError, OSError):
+                self.metrics.record_connect(False)
+                self._schedule_reconnect()
+                raise
+            self.metrics.record_connect(True)
+            self._connect_failures = 0
+            self._missed_replies = 0
+            _enable_keepalive(self._writer)
+            self._poll_scheduler.reset()
+            self._last_reply = asyncio.get_running_loop().time()
+            self._reader_task = asyncio.create_task(self._read_loop(self._reader))
+
+            # Ask every time: the box behind this address may have been swapped or updated.
+            version = await self._send_command("get ver")
+            if version:
+                self.firmware = version
+                self._check_model(version)
+        if self.firmware:
+            _LOG.info("%s Connected, firmware: %s", self.log_id, self.firmware)
         else:
             _LOG.info("%s Connected", self.log_id)
 
@@ -81,11 +366,41 @@ class HDFuryDevice(PersistentConnectionDevice):
     async def close_connection(self):
         _LOG.info("%s Disconnecting", self.log_id)
         await self._close_tcp()
+        self._set_unavailable()
+
+    def _set_unavailable(self) -> None:
+        if self._state != "UNAVAILABLE":
+            self._state = "UNAVAILABLE"
+            self.push_update()
+
+    def _schedule_reconnect(self) -> None:
+        """Set the framework's next retry delay: jittered exponential backoff from 100 ms."""
+        delay = min(RECONNECT_MAX, RECONNECT_BASE * 2 ** self._connect_failures)
+        self._connect_failures += 1
+        retry_in = random.uniform(delay / 2, delay)
+        self._set_retry_delay(retry_in)
+        _LOG.debug("%s Retrying connection in %.2f s", self.log_id, retry_in)
+
+    def _set_retry_delay(self, seconds: float) -> None:
+        # PersistentConnectionDevice has no public hook for the retry delay. In ucapi_framework
+        # 1.9.1 its _connection_loop sleeps for the private ``_backoff_current`` after a failed
+        # attempt, so this is the only place that writes it; pyproject pins the framework to 1.9.x.
+        self._backoff_current = seconds
 
     async def _close_tcp(self):
         writer = self._writer
+        tasks = (self._reader_task, self._sync_task)
         self._reader = None
         self._writer = None
+        self._reader_task = None
+        self._sync_task = None
+        self._pushed.clear()
+        self._unanswered.clear()
+        self._confirmed.clear()
+        for task in tasks:
+            if task and task is not asyncio.current_task():
+                task.cancel()
+        self._fail_pending()
         if writer:
             try:
                 writer.close()
@@ -93,36 +408,174 @@ class HDFuryDevice(PersistentConnectionDevice):
             except Exception:
                 pass
 
-    async def _drain_buffer(self):
-        if not self._reader:
-            return
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        """Route every line and prompt from the device to its pending request or the event queue."""
+        self._reply_since_prompt = False
+        self._prompt_seen = False
+        buffer = ""
         try:
             while True:
-                data = await asyncio.wait_for(self._reader.read(4096), timeout=0.3)
+                data = await reader.read(READ_CHUNK)
                 if not data:
                     break
-        except asyncio.TimeoutError:
-            pass
+
+                frames, buffer = _split_frames(buffer + data.decode("ascii", errors="replace"))
+                if len(buffer) > READ_CHUNK:
+                    frames.append(buffer.strip())
+                    buffer = ""
+                for frame in frames:
+                    if frame == PROMPT:
+                        self._dispatch_prompt()
+                    else:
+                        self._dispatch_line(frame)
+        except asyncio.CancelledError:
+            raise
+        except (ConnectionError, OSError) as err:
+            _LOG.debug("%s Reader stopped: %s", self.log_id, err)
+        finally:
+            self._fail_pending()
+            # Let the poll loop see the closed connection now rather than on its next tick.
+            self._poll_wakeup.set()
+
+    def _dispatch_line(self, line: str) -> None:
+        now = asyncio.get_running_loop().time()
+        self._last_reply = now
+        self._missed_replies = 0
+        pending = self._pending
+        self._drop_finished(now)
+
+        matched = None
+        if pending:
+            matched = _match_pending(line, pending, self._prompt_seen, self._is_notification(line))
+        if matched is None:
+            self._handle_notification(line)
+            return
+
+        for _ in range(matched):
+            request = pending.popleft()
+            self._give_up(request, now)
+            if not request.future.done():
+                request.future.set_result(_no_reply(request.command))
+                if not request.command.startswith("set "):
+                    self.metrics.record_timeout(request.command)
+
+        request = pending.popleft()
+        self._reply_since_prompt = True
+        if request.future.done():
+            # A late reply to a request that timed out: keep what it reports, but no sample.
+            if self._apply_setting_line(line) or self._apply_status_line(line):
+                self._push_changes()
+        else:
+            request.future.set_result(line)
+            self._observe_latency(request, now)
+
+    def _dispatch_prompt(self) -> None:
+        """The device prints its prompt once a command is done; complete a request it left unanswered."""
+        self._prompt_seen = True
+        if self._reply_since_prompt:
+            self._reply_since_prompt = False
+            return
+
+        pending = self._pending
+        now = asyncio.get_running_loop().time()
+        self._drop_finished(now)
+        if not pending:
+            return
+
+        self._last_reply = now
+        self._missed_replies = 0
+        request = pending.popleft()
+        if not request.future.done():
+            request.future.set_result(_no_reply(request.command))
+            self._observe_latency(request, now)
+
+    def _drop_finished(self, now: float) -> None:
+        """Drop finished requests from the head of the queue.
+
+        A request that timed out stays until its late reply and prompt arrive, so they are not
+        taken for those of the next request; after LATE_REPLY_WINDOW it is given up on.
+        """
+        pending = self._pending
+        while pending and pending[0].future.done():
+            head = pending[0]
+            if head.timed_out and now - head.sent_at < LATE_REPLY_WINDOW:
+                return
+            pending.popleft()
+            if head.timed_out:
+                self._give_up(head, now)
+
+    def _give_up(self, request: _Request, now: float) -> None:
+        """Remember an abandoned request, so its reply is not taken for a notification."""
+        if request.prefix:
+            self._unanswered[request.prefix.lower()] = now
+
+    def _is_late_reply(self, line: str, now: float) -> bool:
+        keyword, _ = _split_status_line(line)
+        given_up = self._unanswered.pop(keyword.lower(), None)
+        return given_up is not None and now - given_up < LATE_REPLY_WINDOW
+
+    def _observe_latency(self, request: _Request, now: float) -> None:
+        self.metrics.observe_latency(request.command, now - request.sent_at)
+        self._timeouts.observe(request.command, now - request.sent_at)
+
+    def _handle_notification(self, line: str) -> None:
+        """Apply a line the device sent on its own; entity updates are scheduled, not awaited.
+
+        A status field the device reports by itself is from then on only polled every
+        RECONCILE_INTERVAL. A late reply to a request given up on is applied, but is no sign
+        that the device pushes that field.
+        """
+        _LOG.debug("%s Unsolicited: %s", self.log_id, line)
+        now = asyncio.get_running_loop().time()
+        if self._apply_setting_line(line):
+            self._push_changes()
+            return
+        if not self._apply_status_line(line):
+            return
+        self._push_changes()
+        if self._is_late_reply(line, now):
+            return
+
+        query = self._match_status_query(_split_status_line(line)[0])
+        if query.command not in self._pushed:
+            _LOG.info(
+                "%s Device reports %s by itself, polling it every %d s",
+                self.log_id,
+                query.command,
+                RECONCILE_INTERVAL,
+            )
+            self._pushed.add(query.command)
+            self._poll_scheduler.slow_down(query.command, RECONCILE_INTERVAL)
+        self._poll_scheduler.record(query.command, line, now)
+
+    def _fail_pending(self) -> None:
+        while self._pending:
+            request = self._pending.popleft()
+            if not request.future.done():
+                request.future.set_result(None)
 
     async def maintain_connection(self):
-        asyncio.create_task(self._poll_state())
+        self._sync_task = asyncio.create_task(self._initial_sync())
+        # Offset this device's poll ticks so a rack of devices does not poll in lockstep.
+        await self._wait_for_wakeup(self._poll_phase)
 
-        while self._reader and self._writer and not self._reader.at_eof():
+        while self._connected():
             try:
-                await asyncio.sleep(HEARTBEAT_INTERVAL)
+                tick = BOOST_TICK if self._poll_scheduler.boosted else POLL_TICK
+                idle = asyncio.get_running_loop().time() - self._last_reply
+                await self._wait_for_wakeup(max(0.0, min(tick, HEARTBEAT_INTERVAL - idle)))
 
-                if not self._reader or not self._writer or self._reader.at_eof():
+                if not self._connected():
                     _LOG.warning("%s Connection EOF detected", self.log_id)
                     break
 
-                await self._drain_buffer()
-
-                version = await self._send_command("get ver")
-                if not version:
-                    _LOG.warning("%s Heartbeat failed", self.log_id)
-                    break
+                if asyncio.get_running_loop().time() - self._last_reply >= HEARTBEAT_INTERVAL:
+                    if not await self._send_command("get ver", background=True):
+                        continue
 
-                await self._poll_state()
+                await self._poll_state(due_only=True)
+                if self._settings_stale():
+                    await self._read_settings()
 
             except asyncio.CancelledError:
                 raise
@@ -134,224 +587,569 @@ class HDFuryDevice(PersistentConnectionDevice):
                 break
 
         await self._close_tcp()
+        self._set_unavailable()
+
+    async def _wait_for_wakeup(self, timeout: float) -> None:
+        timer = getattr(self.driver, "fleet_timer", None)
+        if timer is None:
+            # Not wait_for: it drops a disconnect's cancel that lands together
+            # with a wakeup, leaving the poll loop running.
+            handle = asyncio.get_running_loop().call_later(timeout, self._poll_wakeup.set)
+            try:
+                await self._poll_wakeup.wait()
+            finally:
+                handle.cancel()
+        else:
+            timer.wake_after(self.identifier, self._poll_wakeup, timeout)
+            try:
+                await self._poll_wakeup.wait()
+            finally:
+                timer.cancel(self.identifier)
+        self._poll_wakeup.clear()
+
+    async def _send_command(
+        self, command: str, timeout: float | None = None, background: bool = False
+    ) -> str | None:
+        result = (await self._send_batch([command], timeout, background=background))[0]
+        if result is not None and command.startswith("set "):
+            self._boost_polling()
+        return result
+
+    def _connected(self) -> bool:
+        return bool(
+            self._writer
+            and not self._writer.is_closing()
+            and self._reader_task
+            and not self._reader_task.done()
+        )
 
-    async def _send_command(self, command: str, timeout: float = RESPONSE_TIMEOUT) -> str | None:
-        async with self._lock:
-            if not self._writer or not self._reader:
-                return None
+    async def _send_batch(
+        self,
+        commands: list[str],
+        timeout: float | None = None,
+        prefixes: list[str | None] | None = None,
+        background: bool = False,
+    ) -> list[str | None]:
+        """Pipeline *commands* to the device and return their replies in order.
+
+        Interactive batches are written at once. Background batches (polls, heartbeats) go out
+        BACKGROUND_WINDOW commands at a time and hold back while interactive commands are in
+        flight, so a button press never queues behind a whole poll cycle on the device.
+        """
+        if not commands:
+            return []
+
+        if prefixes is None:
+            prefixes = [_response_prefix(command) for command in commands]
+
+        if not background:
+            self._interactive += 1
+            self._interactive_idle.clear()
+            try:
+                return await self._transmit(commands, prefixes, timeout)
+            finally:
+                self._interactive -= 1
+                if not self._interactive:
+                    self._interactive_idle.set()
+
+        results: list[str | None] = []
+        for start in range(0, len(commands), BACKGROUND_WINDOW):
+            await self._interactive_idle.wait()
+            end = start + BACKGROUND_WINDOW
+            results.extend(await self._transmit(commands[start:end], prefixes[start:end], timeout))
+        return results
+
+    async def _transmit(
+        self, commands: list[str], prefixes: list[str | None], timeout: float | None
+    ) -> list[str | None]:
+        """Write all commands back to back and wait for the reader to resolve their replies."""
+        if timeout is None:
+            timeout = self._timeouts.batch_timeout(commands)
+
+        loop = asyncio.get_running_loop()
+        requests = [
+            _Request(command, prefix, loop.create_future())
+            for command, prefix in zip(commands, prefixes)
+        ]
 
-            if self._writer.is_closing() or self._reader.at_eof():
-                return None
+        async with self._lock:
+            if not self._connected():
+                return [None] * len(commands)
 
+            sent_at = loop.time()
+            for request in requests:
+                request.sent_at = sent_at
+            self._pending.extend(requests)
             try:
-                self._writer.write(f"{command}\r\n".encode("ascii"))
+                self._writer.write("".join(f"{command}\r\n" for command in commands).encode("ascii"))
                 await self._writer.drain()
+            except (ConnectionError, OSError) as err:
+                _LOG.debug("%s Commands %s failed: %s", self.log_id, commands, err)
+                for request in requests:
+                    request.future.cancel()
+                return [None] * len(commands)
+
+        await asyncio.wait([request.future for request in requests], timeout=timeout)
+
+        if self._last_reply < sent_at and any(
+            not request.future.done() and not request.command.startswith("set ")
+            for request in requests
+        ):
+            self._note_missed_reply()
+
+        results: list[str | None] = []
+        for request in requests:
+            if request.future.done() and not request.future.cancelled():
+                results.append(request.future.result())
+            else:
+                request.timed_out = True
+                request.future.cancel()
+                results.append(_no_reply(request.command))
+                if request.command.startswith("set ") and not self._prompt_seen:
+                    self._timeouts.record_silent(request.command)
+                else:
+                    self._timeouts.backoff(request.command, timeout)
+                if not request.command.startswith("set "):
+                    self.metrics.record_timeout(request.command)
+        return results
+
+    def _note_missed_reply(self) -> None:
+        """Count writes the device stayed silent after; close a link that looks half-open."""
+        self._missed_replies += 1
+        self._poll_wakeup.set()
+        if self._missed_replies >= MAX_MISSED_REPLIES and self._writer:
+            _LOG.warning(
+                "%s No reply to %d consecutive requests, reconnecting", self.log_id, self._missed_replies
+            )
+            self.metrics.record_stalled_close()
+            self._writer.close()
+
+    async def _poll_state(self, due_only: bool = False) -> list[str]:
+        """Poll the status queries (only those due, with *due_only*); return the unanswered."""
+        queries = self._status_queries
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if due_only:
+            due = set(self._poll_scheduler.due([query.command for query in queries], loop.time()))
+            queries = [query for query in queries if query.command in due]
+            if not queries:
+                return []
+
+        responses = await self._send_batch(
+            [query.command for query in queries],
+            prefixes=[query.prefix for query in queries],
+            background=True,
+        )
+        now = loop.time()
+        for query, response in zip(queries, responses):
+            self._poll_scheduler.record(query.command, response, now)
+            if response:
+                self._apply_status_line(response)
+
+        self.metrics.poll_duration.observe(now - started)
+        if self._config.diagnostic_sensors:
+            self._update_diagnostics()
+        self._push_changes()
+        return [query.command for query, response in zip(queries, responses) if response is None]
+
+    def _update_diagnostics(self) -> None:
+        metrics = self.metrics
+        self._set_sensor_value("diag_latency", str(round(metrics.mean_latency * 1000)))
+        self._set_sensor_value("diag_poll_duration", str(round(metrics.poll_duration.mean * 1000)))
+        self._set_sensor_value("diag_timeouts", str(metrics.total_timeouts))
+        self._set_sensor_value("diag_reconnects", str(metrics.reconnects))
+
+    def _match_status_query(self, keyword: str) -> StatusQuery | None:
+        return self._queries_by_prefix.get(keyword.lower())
+
+    def _is_notification(self, line: str) -> bool:
+        """Return True if *line* reports a status or setting the way device notifications do."""
+        keyword, _ = _split_status_line(line)
+        return (
+            self._match_status_query(keyword) is not None
+            or keyword.lower() in self._setting_keywords
+        )
 
-                result_lines = []
-                deadline = asyncio.get_event_loop().time() + timeout
-
-                while True:
-                    remaining = deadline - asyncio.get_event_loop().time()
-                    if remaining <= 0:
-                        break
-
-                    try:
-                        line = await asyncio.wait_for(
-                            self._reader.readline(),
-                            timeout=min(remaining, 1.0),
-                        )
-                    except asyncio.TimeoutError:
-                        if result_lines:
-                            break
-                        continue
+    def _apply_status_line(self, line: str) -> bool:
+        """Update sensor values from a status reply or notification; return True on change."""
+        keyword, value = _split_status_line(line)
+        query = self._match_status_query(keyword)
+        if query is None:
+            return False
 
-                    if not line:
-                        break
+        if query.sensor_key == "current_input":
+            input_num = value.split()[0] if value else ""
+            if not input_num.isdigit() or int(input_num) >= len(self.source_list):
+                return False
+            self._current_source = self.source_list[int(input_num)]
+            self._confirm("source")
+            return self._set_sensor_value("current_input", self._current_source)
+
+        setattr(self._raw_status, query.sensor_key, value)
+        changed = self._set_sensor_value(query.sensor_key, self._status_value(query))
+        for dependent in self._fallback_dependents.get(query.sensor_key, ()):
+            value = self._status_value(dependent)
+            changed = self._set_sensor_value(dependent.sensor_key, value) or changed
+        return changed
+
+    def _status_value(self, query: StatusQuery) -> str:
+        value = self._raw_status.get(query.sensor_key) or ""
+        if not value and query.fallback_key:
+            return self._sensor_values.get(query.fallback_key) or ""
+        return value
+
+    def _set_sensor_value(self, key: str, value: str) -> bool:
+        if getattr(self._sensor_values, key) == value:
+            return False
+        setattr(self._sensor_values, key, value)
+        self._changed_events.add(f"{SENSOR_EVENT}:{key}")
+        return True
 
-                    decoded = line.decode("ascii", errors="replace").strip()
-                    if not decoded or decoded == ">":
-                        if result_lines:
-                            break
-                        continue
+    def _push_changes(self) -> None:
+        """Notify only the entities subscribed to keys that changed since the last push."""
+        changed, self._changed_events = self._changed_events, set()
+        for event in changed:
+            self.events.emit(event)
 
-                    cleaned = decoded.replace(">", "").strip()
-                    if cleaned:
-                        result_lines.append(cleaned)
-                        break
+    def subscribe_sensor(self, key: str, handler: Callable[[], Awaitable[None]]) -> None:
+        """Call *handler* whenever the value of sensor *key* changes."""
+        self.events.on(f"{SENSOR_EVENT}:{key}", handler)
 
-                if not result_lines:
-                    if command.startswith("set "):
-                        return ""
-                    return None
+    def get_sensor_value(self, key: str) -> str | None:
+        return self._sensor_values.get(key)
 
-                return result_lines[0]
+    def subscribe_setting(self, setting: str, handler: Callable[[], Awaitable[None]]) -> None:
+        """Call *handler* whenever the cached value of *setting* changes."""
+        self.events.on(f"{SETTING_EVENT}:{setting}", handler)
+
+    def unsubscribe_entity(self, entity: object) -> None:
+        """Remove every listener *entity* registered on this device, e.g. once it is replaced."""
+        for event in self.events.event_names():
+            for listener in self.events.listeners(event):
+                if getattr(listener, "__self__", None) is entity:
+                    self.events.remove_listener(event, listener)
+
+    def get_setting(self, setting: str) -> str | None:
+        """Return the last known device value of *setting*, without querying the device."""
+        return self._settings.get(setting)
+
+    def _setting_keyword(self, setting: str) -> str:
+        return self.setting_command(setting).split()[1]
+
+    async def _initial_sync(self) -> None:
+        await self._flush_offline()
+        sent = len(self._status_queries) + len(self._setting_keywords)
+        unanswered = [
+            command
+            for commands in await asyncio.gather(self._poll_state(), self._read_settings())
+            for command in commands
+        ]
+        # A device that answered nothing at all is stuck, not missing features.
+        if len(unanswered) < sent:
+            await self._probe_capabilities(unanswered)
+
+    async def _probe_capabilities(self, unanswered: list[str]) -> None:
+        """Ask the queries the first sync got no reply to once more and count the misses.
+
+        A query is only dropped once it went unanswered on PROBE_CONNECTIONS separate
+        connections, so one bad connection doesn't hide a setting for good. The counts are
+        stored with the device config; running the setup again for the device clears them.
+        """
+        # Queries the first sync got an answer to start counting from zero again.
+        misses = {
+            command: count
+            for command, count in self._config.query_misses.items()
+            if command in unanswered
+        }
+        if unanswered and self._connected():
+            for command in unanswered:
+                self.metrics.record_retry(command)
+            prefixes = {query.command: query.prefix for query in self._status_queries}
+            responses = await self._send_batch(
+                unanswered,
+                prefixes=[
+                    prefixes.get(command, _response_prefix(command)) for command in unanswered
+                ],
+                background=True,
+            )
+            # A dropped connection fails every request; that says nothing about the firmware.
+            if not self._connected():
+                return
+            for command, response in zip(unanswered, responses):
+                if response is None:
+                    misses[command] = misses.get(command, 0) + 1
+                    continue
+                misses.pop(command, None)
+                if command in prefixes:
+                    self._apply_status_line(response)
+                else:
+                    self._apply_setting_line(response)
+            self._push_changes()
+
+        unsupported = sorted(
+            command for command, count in misses.items() if count >= PROBE_CONNECTIONS
+        )
+        for command in unsupported:
+            del misses[command]
+        if misses == self._config.query_misses and not unsupported:
+            return
+        if misses:
+            _LOG.debug("%s Unanswered queries so far: %s", self.log_id, misses)
+        self.update_config(
+            unsupported_queries=sorted(self._unsupported.union(unsupported)),
+            query_misses=misses,
+            probed_firmware=self.firmware or "",
+        )
+        if not unsupported:
+            return
 
-            except asyncio.TimeoutError:
-                if command.startswith("set "):
-                    return ""
-                return None
-            except (ConnectionError, OSError, BrokenPipeError):
-                return None
-            except Exception as err:
-                _LOG.debug("%s Command '%s' failed: %s", self.log_id, command, err)
-                return None
+        _LOG.info(
+            "%s No reply to %s on %d connections, no longer sending %s",
+            self.log_id,
+            ", ".join(unsupported),
+            PROBE_CONNECTIONS,
+            "it" if len(unsupported) == 1 else "them",
+        )
+        self._unsupported.update(unsupported)
+        self._set_model(self.model_config)
+        self._refresh_entities()
+        self.push_update()
 
-    async def _poll_state(self) -> None:
-        if self.model_config.input_count > 0:
-            response = await self._send_command("get insel")
-            if response and "insel" in response:
-                parts = response.split()
-                if len(parts) >= 2:
-                    input_num = parts[1]
-                    if input_num.isdigit():
-                        idx = int(input_num)
-                        if 0 <= idx < len(self.source_list):
-                            self._current_source = self.source_list[idx]
-                            self._sensor_values["current_input"] = self._current_source
-
-        response = await self._send_command("get status rx0")
-        if response and "RX0:" in response:
-            self._sensor_values["video_input"] = response.replace("RX0:", "").strip()
-
-        response = await self._send_command("get status audout")
-        if response and "AUDOUT:" in response:
-            self._sensor_values["audio_rx"] = response.replace("AUDOUT:", "").strip()
-
-        if self.model_config.matrix_outputs and self.model_config.matrix_outputs >= 1:
-            response = await self._send_command("get status tx0")
-            if response and "TX0:" in response:
-                self._sensor_values["video_tx0"] = response.replace("TX0:", "").strip()
-
-            response = await self._send_command("get status tx0sink")
-            if response and "TX0SINK:" in response:
-                self._sensor_values["sink_tx0"] = response.replace("TX0SINK:", "").strip()
-
-            self._sensor_values["audio_tx0"] = await self._get_audio_tx(0)
-
-        if self.model_config.matrix_outputs and self.model_config.matrix_outputs >= 2:
-            response = await self._send_command("get status tx1")
-            if response and "TX1:" in response:
-                self._sensor_values["video_tx1"] = response.replace("TX1:", "").strip()
-
-            response = await self._send_command("get status tx1sink")
-            if response and "TX1SINK:" in response:
-                self._sensor_values["sink_tx1"] = response.replace("TX1SINK:", "").strip()
-
-            self._sensor_values["audio_tx1"] = await self._get_audio_tx(1)
+    async def _read_settings(self) -> list[str]:
+        """Fill the settings cache with one pipelined read of every supported setting.
+
+        Return the queries that got no reply.
+        """
+        commands = [f"get {keyword}" for keyword in self._setting_keywords]
+        self._settings_read_at = asyncio.get_running_loop().time()
+        responses = await self._send_batch(commands, background=True)
+        for response in responses:
+            if response:
+                self._apply_setting_line(response)
+        self._push_changes()
+        return [command for command, response in zip(commands, responses) if response is None]
+
+    def _apply_setting_line(self, line: str) -> bool:
+        parts = line.split(None, 1)
+        setting = self._setting_keywords.get(parts[0].lower()) if parts else None
+        if setting is None or len(parts) < 2:
+            return False
+        self._confirm(setting)
+        return self._set_setting(setting, parts[1].strip())
 
-        self.push_update()
+    def _confirm(self, setting: str) -> None:
+        self._confirmed[setting] = asyncio.get_running_loop().time()
 
-    async def _get_audio_tx(self, output: int) -> str:
-        mode_resp = await self._send_command(f"get audiomodetx{output}")
-        mode = ""
-        if mode_resp and f"audiomodetx{output}" in mode_resp:
-            parts = mode_resp.split(None, 1)
-            if len(parts) >= 2:
-                mode = parts[1]
-
-        status_resp = await self._send_command(f"get status aud{output}")
-        if status_resp and f"AUD{output}:" in status_resp:
-            audio_info = status_resp.replace(f"AUD{output}:", "").strip()
-            if audio_info:
-                return audio_info
-        return mode
+    def _settings_stale(self) -> bool:
+        """Return True if skip mode needs the settings cache read again.
 
-    def get_sensor_value(self, key: str) -> str | None:
-        return self._sensor_values.get(key)
+        Changes made on the device itself are only seen by reading the settings, so skip mode
+        re-reads them every SETTINGS_RECONCILE_INTERVAL; without it the cache only feeds the
+        select entities and is left alone.
+        """
+        if not self._config.skip_redundant_commands:
+            return False
+        age = asyncio.get_running_loop().time() - self._settings_read_at
+        return age >= SETTINGS_RECONCILE_INTERVAL
+
+    def _set_setting(self, setting: str, value: str) -> bool:
+        if self._settings.get(setting) == value:
+            return False
+        self._settings[setting] = value
+        self._changed_events.add(f"{SETTING_EVENT}:{setting}")
+        return True
 
     async def send_command(self, command: str) -> bool:
         result = await self._send_command(command)
         return result is not None
 
-    async def set_source(self, source: str) -> bool:
-        if self.model_config.model_id == "vertex":
-            source_map = {"Top": "top", "Bottom": "bot"}
-            cmd_source = source_map.get(source, "top")
-            result = await self._send_command(f"set input {cmd_source}")
-        elif self.model_config.source_command:
-            source_num = source.replace("HDMI ", "").strip()
-            result = await self._send_command(f"set {self.model_config.source_command} {source_num}")
-        else:
+    def setting_command(self, setting: str, value: str = "") -> str | None:
+        """Return the protocol command that applies *value* to *setting*, or None if unsupported."""
+        if setting == "source":
+            if self.model_config.model_id == "vertex":
+                return f"set input {format_source_for_command(value, self.model_config)}"
+            if not self.model_config.source_command:
+                return None
+            source_num = format_source_for_command(value, self.model_config)
+            return f"set {self.model_config.source_command} {source_num}"
+
+        if setting == "hdcp" and value == "14":
+            value = "1.4"
+        elif setting == "scale" and self.model_config.model_id == "arcana2":
+            setting = "scalemode"
+
+        return f"set {setting} {value}".rstrip()
+
+    async def apply_setting(self, setting: str, value: str = "") -> bool:
+        return await self.apply_settings([(setting, value)]) is None
+
+    async def apply_settings(
+        self, settings: list[tuple[str, str]], boost: bool = True
+    ) -> int | None:
+        """Send all settings as one pipelined batch; return the index of the first failed step.
+
+        Unless *boost* is off, the fast-changing status fields are polled again right after.
+        """
+        commands = [self.setting_command(setting, value) for setting, value in settings]
+        if None in commands:
+            return commands.index(None)
+
+        if not self._connected():
+            return self._queue_offline(settings)
+
+        to_send = [
+            index
+            for index, (setting, value) in enumerate(settings)
+            if not self._is_redundant(setting, value, commands[index])
+        ]
+        if len(to_send) < len(commands):
+            _LOG.debug(
+                "%s Skipping %d redundant command(s)", self.log_id, len(commands) - len(to_send)
+            )
+
+        results: list[str | None] = [""] * len(commands)
+        responses = await self._send_batch([commands[index] for index in to_send])
+        for index, response in zip(to_send, responses):
+            results[index] = response
+
+        failed: int | None = None
+        applied = False
+        for index in to_send:
+            setting, value = settings[index]
+            result = results[index]
+            if result is None:
+                if failed is None:
+                    failed = index
+                continue
+            applied = True
+            self._confirm(setting)
+            if setting == "source":
+                self._current_source = value
+                self._set_sensor_value("current_input", value)
+                continue
+            parts = commands[index].split(None, 2)
+            if len(parts) == 3:
+                self._set_setting(setting, parts[2])
+
+        if applied:
+            self._push_changes()
+            if boost:
+                self._boost_polling()
+        return failed
+
+    def _queue_offline(self, settings: list[tuple[str, str]]) -> int | None:
+        """Hold settings until the device reconnects, keeping only the latest value per setting.
+
+        A batch with a step that may not be queued is refused as a whole, so no part of it
+        runs later on its own.
+        """
+        for index, (setting, _) in enumerate(settings):
+            if setting in NOT_QUEUED:
+                return index
+        now = asyncio.get_running_loop().time()
+        for setting, value in settings:
+            self._offline.pop(setting, None)
+            self._offline[setting] = (value, now)
+            if len(self._offline) > OFFLINE_QUEUE_SIZE:
+                dropped, _ = self._offline.popitem(last=False)
+                _LOG.warning("%s Offline queue full, dropped %s", self.log_id, dropped)
+        _LOG.info("%s Not connected, queued %d command(s)", self.log_id, len(settings))
+        return None
+
+    async def _flush_offline(self) -> None:
+        """Send the commands queued while disconnected as one batch, skipping expired ones."""
+        if not self._offline:
+            return
+        now = asyncio.get_running_loop().time()
+        settings = [
+            (setting, value)
+            for setting, (value, queued_at) in self._offline.items()
+            if now - queued_at <= OFFLINE_TTL
+        ]
+        expired = len(self._offline) - len(settings)
+        self._offline.clear()
+        if expired:
+            _LOG.info("%s Dropped %d expired queued command(s)", self.log_id, expired)
+        if settings:
+            _LOG.info("%s Sending %d queued command(s)", self.log_id, len(settings))
+            # No boost: the initial sync reads every status right after the flush.
+            await self.apply_settings(settings, boost=False)
+
+    def _is_redundant(self, setting: str, value: str, command: str) -> bool:
+        """Return True if idempotent mode is on and the device recently confirmed this value.
+
+        A value the device has not confirmed within SKIP_FRESHNESS may have been changed on the
+        device itself, so the command is sent anyway.
+        """
+        if not self._config.skip_redundant_commands:
+            return False
+        confirmed = self._confirmed.get(setting)
+        if confirmed is None or asyncio.get_running_loop().time() - confirmed >= SKIP_FRESHNESS:
             return False
+        if setting == "source":
+            return value == self._current_source
+        parts = command.split(None, 2)
+        cached = self._settings.get(setting)
+        return len(parts) == 3 and cached is not None and cached.lower() == parts[2].lower()
 
-        if result is not None:
-            self._current_source = source
-            self._sensor_values["current_input"] = source
-            self.push_update()
-            return True
-        return False
+    def _boost_polling(self) -> None:
+        self._poll_scheduler.boost()
+        self._poll_wakeup.set()
+
+    async def set_source(self, source: str) -> bool:
+        return await self.apply_setting("source", source)
 
     async def set_edid_mode(self, mode: str) -> bool:
-        result = await self._send_command(f"set edidmode {mode}")
-        return result is not None
+        return await self.apply_setting("edidmode", mode)
 
     async def set_hdcp_mode(self, mode: str) -> bool:
-        if mode == "14":
-            mode = "1.4"
-        result = await self._send_command(f"set hdcp {mode}")
-        return result is not None
+        return await self.apply_setting("hdcp", mode)
 
     async def set_hdr_custom(self, enabled: bool) -> bool:
-        result = await self._send_command(f"set hdrcustom {'on' if enabled else 'off'}")
-        return result is not None
+        return await self.apply_setting("hdrcustom", _on_off(enabled))
 
     async def set_hdr_disable(self, enabled: bool) -> bool:
-        result = await self._send_command(f"set hdrdisable {'on' if enabled else 'off'}")
-        return result is not None
+        return await self.apply_setting("hdrdisable", _on_off(enabled))
 
     async def set_cec(self, enabled: bool) -> bool:
-        result = await self._send_command(f"set cec {'on' if enabled else 'off'}")
-        return result is not None
+        return await self.apply_setting("cec", _on_off(enabled))
 
     async def set_earc_force(self, mode: str) -> bool:
-        result = await self._send_command(f"set earcforce {mode}")
-        return result is not None
+        return await self.apply_setting("earcforce", mode)
 
     async def set_arc_force(self, mode: str) -> bool:
-        result = await self._send_command(f"set arcforce {mode}")
-        return result is not None
+        return await self.apply_setting("arcforce", mode)
 
     async def set_oled(self, enabled: bool) -> bool:
-        result = await self._send_command(f"set oled {'on' if enabled else 'off'}")
-        return result is not None
+        return await self.apply_setting("oled", _on_off(enabled))
 
     async def set_autoswitch(self, enabled: bool) -> bool:
-        result = await self._send_command(f"set autosw {'on' if enabled else 'off'}")
-        return result is not None
+        return await self.apply_setting("autosw", _on_off(enabled))
 
     async def set_scale_mode(self, mode: str) -> bool:
-        cmd = "scalemode" if self.model_config.model_id == "arcana2" else "scale"
-        result = await self._send_command(f"set {cmd} {mode}")
-        return result is not None
+        return await self.apply_setting("scale", mode)
 
     async def hotplug(self) -> bool:
-        result = await self._send_command("set hotplug")
-        return result is not None
+        return await self.apply_setting("hotplug")
 
     async def reboot(self) -> bool:
-        result = await self._send_command("set reboot")
-        return result is not None
+        return await self.apply_setting("reboot")
 
     async def set_edid_audio(self, source: str) -> bool:
-        result = await self._send_command(f"set edidaudio {source}")
-        return result is not None
+        return await self.apply_setting("edidaudio", source)
 
     async def set_audio_mode(self, mode: str) -> bool:
-        result = await self._send_command(f"set audiomode {mode}")
-        return result is not None
+        return await self.apply_setting("audiomode", mode)
 
     async def set_led_mode(self, mode: str) -> bool:
-        result = await self._send_command(f"set led {mode}")
-        return result is not None
+        return await self.apply_setting("led", mode)
 
     async def set_color_space(self, mode: str) -> bool:
-        result = await self._send_command(f"set colorspace {mode}")
-        return result is not None
+        return await self.apply_setting("colorspace", mode)
 
     async def set_deep_color(self, mode: str) -> bool:
-        result = await self._send_command(f"set deepcolor {mode}")
-        return result is not None
+        return await self.apply_setting("deepcolor", mode)
 
     async def set_output_resolution(self, resolution: str) -> bool:
-        result = await self._send_command(f"set outres {resolution}")
-        return result is not None
+        return await self.apply_setting("outres", resolution)
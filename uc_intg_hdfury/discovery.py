@@ -0,0 +1,137 @@
+"""
+HDFury LAN discovery.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import os
+import socket
+
+from ucapi_framework.discovery import DiscoveredDevice, NetworkScanDiscovery
+
+from uc_intg_hdfury.models import MODEL_CONFIGS, ModelConfig, identify_model
+
+_LOG = logging.getLogger(__name__)
+
+DISCOVERY_PORTS = sorted({config.default_port for config in MODEL_CONFIGS.values()})
+DISCOVERY_CONCURRENCY = 256
+PROBE_CONNECT_TIMEOUT = 0.5
+PROBE_REPLY_TIMEOUT = 1.0
+
+
+def local_network() -> str | None:
+    """Return the /24 of the interface that routes to the outside world, if there is one."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            # Connecting a UDP socket only picks the route; nothing is sent.
+            sock.connect(("192.0.2.1", 9))
+            address = sock.getsockname()[0]
+        except OSError:
+            return None
+    if address.startswith("127."):
+        return None
+    return str(ipaddress.ip_network(f"{address}/24", strict=False))
+
+
+class HDFuryDiscovery(NetworkScanDiscovery):
+    """Find HDFury devices by asking every host of a /24 for its version on the model ports."""
+
+    def __init__(
+        self,
+        ip_range: str | None = None,
+        ports: list[int] | None = None,
+        timeout: int = 5,
+        concurrency: int = DISCOVERY_CONCURRENCY,
+    ):
+        ip_range = ip_range or os.getenv("UC_HDFURY_DISCOVERY_RANGE") or ""
+        super().__init__(ip_range, ports or DISCOVERY_PORTS, timeout)
+        self.concurrency = concurrency
+
+    async def discover(self) -> list[DiscoveredDevice]:
+        ip_range = self.ip_range or local_network()
+        if not ip_range:
+            _LOG.info("No local network to scan, skipping discovery")
+            return []
+
+        network = ipaddress.ip_network(ip_range, strict=False)
+        _LOG.info("Scanning %s on ports %s", network, self.ports)
+        slots = asyncio.Semaphore(self.concurrency)
+        found: dict[str, DiscoveredDevice] = {}
+
+        async def probe(ip: str, port: int) -> None:
+            async with slots:
+                if ip in found:
+                    return
+                device = await self.probe_device(ip, port)
+            if device and ip not in found:
+                found[ip] = device
+
+        tasks = [
+            asyncio.create_task(probe(str(host), port))
+            for host in network.hosts()
+            for port in self.ports
+        ]
+        _, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            _LOG.warning(
+                "Discovery stopped after %d s with %d probes left", self.timeout, len(pending)
+            )
+
+        self._discovered_devices = sorted(
+            found.values(), key=lambda device: ipaddress.ip_address(device.address)
+        )
+        _LOG.info("Found %d HDFury device(s) on %s", len(found), network)
+        return self._discovered_devices
+
+    async def probe_device(self, ip: str, port: int) -> DiscoveredDevice | None:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port), timeout=PROBE_CONNECT_TIMEOUT
+            )
+        except (asyncio.TimeoutError, OSError):
+            return None
+
+        try:
+            writer.write(b"get ver\r\n")
+            await writer.drain()
+            version, model_config = await asyncio.wait_for(
+                self._read_version(reader), timeout=PROBE_REPLY_TIMEOUT
+            )
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        _LOG.debug("Found %s at %s:%d (%s)", model_config.display_name, ip, port, version)
+        return DiscoveredDevice(
+            identifier=f"hdfury_{ip.replace('.', '_')}",
+            name=f"HDFury {model_config.display_name}",
+            address=ip,
+            extra_data={"model": model_config.model_id, "port": port, "version": version},
+        )
+
+    @staticmethod
+    async def _read_version(reader: asyncio.StreamReader) -> tuple[str, ModelConfig]:
+        """Read until a line names a known model; banners and prompts before it are skipped."""
+        buffer = ""
+        while True:
+            data = await reader.read(1024)
+            if not data:
+                raise ConnectionResetError("closed before replying")
+            buffer += data.decode("ascii", errors="replace")
+            *lines, buffer = buffer.replace(">", "\n").split("\n")
+            for line in lines:
+                model_config = identify_model(line)
+                if model_config:
+                    return line.strip(), model_config
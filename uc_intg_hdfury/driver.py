@@ -5,18 +5,42 @@ HDFury driver.
 :license: MPL-2.0, see LICENSE for more details.
 """
 
+import asyncio
 import logging
+import os
+import time
 
 from ucapi_framework import BaseIntegrationDriver
 
 from uc_intg_hdfury.config import HDFuryConfig
 from uc_intg_hdfury.device import HDFuryDevice
-from uc_intg_hdfury.remote import HDFuryRemote
-from uc_intg_hdfury.sensor import create_sensors
-from uc_intg_hdfury.select_entities import create_select_entities
+from uc_intg_hdfury.fleet import FleetTimer
+from uc_intg_hdfury.metrics import DeviceMetrics, json_snapshot, prometheus_text, serve_metrics
 
 _LOG = logging.getLogger(__name__)
 
+MAX_CONCURRENT_CONNECTS = int(os.getenv("UC_HDFURY_MAX_CONNECTS", "4"))
+PHASE_STEP = 0.6180339887
+
+
+# Entity modules pull in the ucapi entity and UI types; import them when the first device registers.
+def _create_remote(cfg: HDFuryConfig, dev: HDFuryDevice):
+    from uc_intg_hdfury.remote import HDFuryRemote
+
+    return HDFuryRemote(cfg, dev)
+
+
+def _create_sensors(cfg: HDFuryConfig, dev: HDFuryDevice):
+    from uc_intg_hdfury.sensor import create_sensors
+
+    return create_sensors(cfg, dev)
+
+
+def _create_selects(cfg: HDFuryConfig, dev: HDFuryDevice):
+    from uc_intg_hdfury.select_entities import create_select_entities
+
+    return create_select_entities(cfg, dev)
+
 
 class HDFuryDriver(BaseIntegrationDriver[HDFuryDevice, HDFuryConfig]):
     """HDFury integration driver."""
@@ -24,11 +48,80 @@ class HDFuryDriver(BaseIntegrationDriver[HDFuryDevice, HDFuryConfig]):
     def __init__(self):
         super().__init__(
             device_class=HDFuryDevice,
-            entity_classes=[
-                HDFuryRemote,
-                lambda cfg, dev: create_sensors(cfg, dev),
-                lambda cfg, dev: create_select_entities(cfg, dev),
-            ],
+            entity_classes=[_create_remote, _create_sensors, _create_selects],
             driver_id="uc-intg-hdfury",
-            require_connection_before_registry=True,
+            require_connection_before_registry=False,
         )
+        self.connect_slots = asyncio.Semaphore(MAX_CONCURRENT_CONNECTS)
+        self.fleet_timer = FleetTimer()
+        self._phase_index = 0
+        self._started_at = time.monotonic()
+        self._ready: set[str] = set()
+        self._startup_reported = False
+        self._metrics_server: asyncio.AbstractServer | None = None
+
+    def next_poll_phase(self) -> float:
+        """Return the next device's poll offset as a fraction of the period, evenly spread."""
+        phase = (self._phase_index * PHASE_STEP) % 1.0
+        self._phase_index += 1
+        return phase
+
+    def on_device_added(self, device_config: HDFuryConfig | None) -> None:
+        """Register the new device's entities right away and connect in the background."""
+        self.add_configured_device(device_config, connect=True)
+
+    async def on_device_connected(self, device_id: str) -> None:
+        await super().on_device_connected(device_id)
+        if self._startup_reported or device_id in self._ready:
+            return
+        elapsed = time.monotonic() - self._started_at
+        self._ready.add(device_id)
+        _LOG.debug("Device %s ready %.2f s after startup", device_id, elapsed)
+
+        configured = {self.get_device_id(config) for config in self.config_manager.all()}
+        if configured <= self._ready:
+            self._startup_reported = True
+            _LOG.info("All %d device(s) ready %.2f s after startup", len(configured), elapsed)
+
+    def refresh_available_entities(self, device_config: HDFuryConfig, device: HDFuryDevice) -> None:
+        """Rebuild the device's entities, e.g. after it turned out to be another model."""
+        available = self.api.available_entities
+        configured = self.api.configured_entities
+        entity_ids = self.get_entity_ids_for_device(self.get_device_id(device_config))
+        replaced = []
+        for entity_id in entity_ids:
+            if available.contains(entity_id):
+                replaced.append(available.get(entity_id))
+                available.remove(entity_id)
+        self.register_available_entities(device_config, device)
+        # Configured entities keep serving commands: swap in the rebuilt ones, drop the rest.
+        for entity_id in entity_ids:
+            if configured.contains(entity_id):
+                replaced.append(configured.get(entity_id))
+                configured.remove(entity_id)
+                if available.contains(entity_id):
+                    configured.add(available.get(entity_id))
+        for entity in replaced:
+            device.unsubscribe_entity(entity)
+
+    def _device_metrics(self) -> list[tuple[str, DeviceMetrics]]:
+        return [(device_id, device.metrics) for device_id, device in self._device_instances.items()]
+
+    def metrics_text(self) -> str:
+        """Return metrics of all devices in the Prometheus text format."""
+        return prometheus_text(self._device_metrics())
+
+    def metrics_json(self) -> str:
+        """Return metrics of all devices as a JSON snapshot."""
+        return json_snapshot(self._device_metrics())
+
+    async def start_metrics_server(self, port: int, host: str = "127.0.0.1") -> None:
+        """Expose ``/metrics`` and ``/metrics.json`` on *host*:*port*."""
+        self._metrics_server = await serve_metrics(port, self._device_metrics, host=host)
+
+    async def stop_metrics_server(self) -> None:
+        if self._metrics_server is None:
+            return
+        server, self._metrics_server = self._metrics_server, None
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,57 @@
+"""
+HDFury fleet-wide poll timer.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import heapq
+import itertools
+
+
+class FleetTimer:
+    """Wake every device's poll loop from one timer wheel instead of one timeout per device."""
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str]] = []
+        self._wakeups: dict[str, tuple[int, asyncio.Event]] = {}
+        self._sequence = itertools.count()
+        self._handle: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self._wakeups)
+
+    def wake_after(self, key: str, event: asyncio.Event, delay: float) -> None:
+        """Set *event* after *delay* seconds, replacing any wakeup still pending for *key*."""
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        sequence = next(self._sequence)
+        self._wakeups[key] = (sequence, event)
+        heapq.heappush(self._heap, (when, sequence, key))
+        if self._handle is None or when < self._handle.when():
+            self._arm(loop)
+
+    def cancel(self, key: str) -> None:
+        self._wakeups.pop(key, None)
+
+    def _is_current(self, sequence: int, key: str) -> bool:
+        wakeup = self._wakeups.get(key)
+        return wakeup is not None and wakeup[0] == sequence
+
+    def _arm(self, loop: asyncio.AbstractEventLoop) -> None:
+        while self._heap and not self._is_current(self._heap[0][1], self._heap[0][2]):
+            heapq.heappop(self._heap)
+        if self._handle:
+            self._handle.cancel()
+        self._handle = loop.call_at(self._heap[0][0], self._fire, loop) if self._heap else None
+
+    def _fire(self, loop: asyncio.AbstractEventLoop) -> None:
+        now = loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, key = heapq.heappop(self._heap)
+            if self._is_current(sequence, key):
+                _, event = self._wakeups.pop(key)
+                event.set()
+        self._handle = None
+        self._arm(loop)
@@ -0,0 +1,278 @@
+"""
+HDFury per-device protocol metrics.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable
+
+_LOG = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MIN_TIMEOUT = 0.25
+BATCH_STEP = 0.05
+
+
+def command_verb(command: str) -> str:
+    """Group *command* by its first two tokens, e.g. ``get status`` or ``set edidmode``."""
+    return " ".join(command.split()[:2])
+
+
+class Histogram:
+    """Cumulative latency histogram in seconds with fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the *q* quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, count in zip(self.buckets, self.counts):
+            if count >= rank:
+                return bound
+        return self.maximum
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "max": round(self.maximum, 6),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+
+def _smooth(estimate: tuple[float, float] | None, sample: float) -> tuple[float, float]:
+    if estimate is None:
+        return sample, sample / 2
+    srtt, rttvar = estimate
+    rttvar = 0.75 * rttvar + 0.25 * abs(srtt - sample)
+    return 0.875 * srtt + 0.125 * sample, rttvar
+
+
+class ResponseTimeouts:
+    """Reply timeouts per command verb, learned from observed round trips like a TCP RTO.
+
+    Only replies that arrived in time are samples; a timeout doubles the verb's timeout until
+    the next one, so a device that slowed down is not timed out on every request.
+    """
+
+    def __init__(self, ceiling: float, floor: float = MIN_TIMEOUT):
+        self._ceiling = ceiling
+        self._floor = floor
+        self._rtt: dict[str, tuple[float, float]] = {}
+        self._overall: tuple[float, float] | None = None
+        self._silent: set[str] = set()
+        self._backoff: dict[str, float] = {}
+
+    def observe(self, command: str, seconds: float) -> None:
+        verb = command_verb(command)
+        self._rtt[verb] = _smooth(self._rtt.get(verb), seconds)
+        self._overall = _smooth(self._overall, seconds)
+        self._silent.discard(verb)
+        self._backoff.pop(verb, None)
+
+    def backoff(self, command: str, waited: float) -> None:
+        """Double the timeout of *command*'s verb after it went unanswered for *waited* seconds."""
+        verb = command_verb(command)
+        self._backoff[verb] = min(self._ceiling, max(self._backoff.get(verb, 0.0), 2 * waited))
+
+    def record_silent(self, command: str) -> None:
+        """Remember that the device never answers *command*, so later ones need not wait long."""
+        self._silent.add(command_verb(command))
+
+    def timeout(self, command: str) -> float:
+        verb = command_verb(command)
+        estimate = self._rtt.get(verb)
+        if estimate is None and verb in self._silent:
+            estimate = self._overall
+        if estimate is None:
+            return self._ceiling
+        srtt, rttvar = estimate
+        learned = min(self._ceiling, max(self._floor, srtt + 4 * rttvar))
+        return max(learned, self._backoff.get(verb, 0.0))
+
+    def batch_timeout(self, commands: list[str]) -> float:
+        """Timeout for *commands* written back to back and answered in order."""
+        longest = max(self.timeout(command) for command in commands)
+        return min(self._ceiling, longest + BATCH_STEP * (len(commands) - 1))
+
+
+class DeviceMetrics:
+    """Latency, timeout and connection counters for one device."""
+
+    def __init__(self):
+        self.latency: dict[str, Histogram] = {}
+        self.timeouts: dict[str, int] = {}
+        self.retries: dict[str, int] = {}
+        self.poll_duration = Histogram()
+        self.connects = 0
+        self.connect_failures = 0
+        self.reconnects = 0
+        self.stalled_closes = 0
+
+    def observe_latency(self, command: str, seconds: float) -> None:
+        verb = command_verb(command)
+        histogram = self.latency.get(verb)
+        if histogram is None:
+            histogram = self.latency[verb] = Histogram()
+        histogram.observe(seconds)
+
+    def record_timeout(self, command: str) -> None:
+        verb = command_verb(command)
+        self.timeouts[verb] = self.timeouts.get(verb, 0) + 1
+
+    def record_retry(self, command: str) -> None:
+        verb = command_verb(command)
+        self.retries[verb] = self.retries.get(verb, 0) + 1
+
+    def record_stalled_close(self) -> None:
+        """Count a connection closed because the device stopped replying on it."""
+        self.stalled_closes += 1
+
+    def record_connect(self, success: bool) -> None:
+        if not success:
+            self.connect_failures += 1
+            return
+        if self.connects:
+            self.reconnects += 1
+        self.connects += 1
+
+    @property
+    def total_timeouts(self) -> int:
+        return sum(self.timeouts.values())
+
+    @property
+    def mean_latency(self) -> float:
+        count = sum(histogram.count for histogram in self.latency.values())
+        total = sum(histogram.total for histogram in self.latency.values())
+        return total / count if count else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "latency": {verb: hist.snapshot() for verb, hist in sorted(self.latency.items())},
+            "timeouts": dict(sorted(self.timeouts.items())),
+            "retries": dict(sorted(self.retries.items())),
+            "poll_duration": self.poll_duration.snapshot(),
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "reconnects": self.reconnects,
+            "stalled_closes": self.stalled_closes,
+        }
+
+    def prometheus_lines(self, device_id: str) -> list[str]:
+        lines = []
+        for verb, histogram in sorted(self.latency.items()):
+            labels = f'device="{device_id}",verb="{verb}"'
+            lines.extend(_histogram_lines("hdfury_command_latency_seconds", labels, histogram))
+        for verb, count in sorted(self.timeouts.items()):
+            lines.append(f'hdfury_command_timeouts_total{{device="{device_id}",verb="{verb}"}} {count}')
+        for verb, count in sorted(self.retries.items()):
+            lines.append(f'hdfury_command_retries_total{{device="{device_id}",verb="{verb}"}} {count}')
+        lines.extend(
+            _histogram_lines("hdfury_poll_duration_seconds", f'device="{device_id}"', self.poll_duration)
+        )
+        lines.append(f'hdfury_connects_total{{device="{device_id}"}} {self.connects}')
+        lines.append(f'hdfury_connect_failures_total{{device="{device_id}"}} {self.connect_failures}')
+        lines.append(f'hdfury_reconnects_total{{device="{device_id}"}} {self.reconnects}')
+        lines.append(f'hdfury_stalled_closes_total{{device="{device_id}"}} {self.stalled_closes}')
+        return lines
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> list[str]:
+    lines = [
+        f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+        for bound, count in zip(histogram.buckets, histogram.counts)
+    ]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def prometheus_text(devices: Iterable[tuple[str, DeviceMetrics]]) -> str:
+    """Render metrics of all *devices* in the Prometheus text exposition format."""
+    lines = [
+        "# TYPE hdfury_command_latency_seconds histogram",
+        "# TYPE hdfury_command_timeouts_total counter",
+        "# TYPE hdfury_command_retries_total counter",
+        "# TYPE hdfury_poll_duration_seconds histogram",
+        "# TYPE hdfury_connects_total counter",
+        "# TYPE hdfury_connect_failures_total counter",
+        "# TYPE hdfury_reconnects_total counter",
+        "# TYPE hdfury_stalled_closes_total counter",
+    ]
+    for device_id, metrics in devices:
+        lines.extend(metrics.prometheus_lines(device_id))
+    return "\n".join(lines) + "\n"
+
+
+def json_snapshot(devices: Iterable[tuple[str, DeviceMetrics]]) -> str:
+    return json.dumps({device_id: metrics.snapshot() for device_id, metrics in devices}, indent=2)
+
+
+async def serve_metrics(
+    port: int,
+    devices: Callable[[], Iterable[tuple[str, DeviceMetrics]]],
+    host: str = "127.0.0.1",
+) -> asyncio.AbstractServer:
+    """Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` over plain HTTP.
+
+    The endpoint has no authentication, so it only listens on the loopback unless *host* says
+    otherwise.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            parts = request.decode("ascii", errors="replace").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            while (await asyncio.wait_for(reader.readline(), timeout=5.0)).strip():
+                pass
+
+            if path == "/metrics.json":
+                status, content_type, body = "200 OK", "application/json", json_snapshot(devices())
+            elif path == "/metrics":
+                status, content_type = "200 OK", "text/plain; version=0.0.4"
+                body = prometheus_text(devices())
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "not found\n"
+
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("ascii")
+                + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    _LOG.info("Serving metrics on %s:%d", host, port)
+    return server
@@ -4,40 +4,153 @@ HDFury Integration for Unfolded Circle Remote Two/3.
 :copyright: (c) 2025 by Meir Miyara.
 :license: MPL-2.0, see LICENSE for more details.
 """
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple
 
-@dataclass
+@dataclass(frozen=True)
+class StatusQuery:
+    command: str
+    prefix: str
+    sensor_key: str
+    interval: float = 20.0
+    per_output: bool = False
+    requires_inputs: bool = False
+    fallback_key: Optional[str] = None
+
+    def for_output(self, output: int) -> "StatusQuery":
+        return replace(
+            self,
+            command=self.command.format(n=output),
+            prefix=self.prefix.format(n=output),
+            sensor_key=self.sensor_key.format(n=output),
+            fallback_key=self.fallback_key.format(n=output) if self.fallback_key else None,
+        )
+
+STATUS_QUERIES: Tuple[StatusQuery, ...] = (
+    StatusQuery("get insel", "insel", "current_input", interval=10.0, requires_inputs=True),
+    StatusQuery("get status rx0", "RX0:", "video_input", interval=10.0),
+    StatusQuery("get status audout", "AUDOUT:", "audio_rx"),
+    StatusQuery("get status tx{n}", "TX{n}:", "video_tx{n}", per_output=True),
+    StatusQuery(
+        "get status tx{n}sink", "TX{n}SINK:", "sink_tx{n}", interval=120.0, per_output=True
+    ),
+    StatusQuery(
+        "get audiomodetx{n}", "audiomodetx{n}", "audio_mode_tx{n}", interval=60.0, per_output=True
+    ),
+    StatusQuery(
+        "get status aud{n}", "AUD{n}:", "audio_tx{n}", per_output=True,
+        fallback_key="audio_mode_tx{n}",
+    ),
+)
+
+@dataclass(slots=True)
+class SensorState:
+    """Latest value of every sensor a device can report, with fixed fields per output."""
+    current_input: Optional[str] = None
+    video_input: Optional[str] = None
+    audio_rx: Optional[str] = None
+    video_tx0: Optional[str] = None
+    sink_tx0: Optional[str] = None
+    audio_mode_tx0: Optional[str] = None
+    audio_tx0: Optional[str] = None
+    video_tx1: Optional[str] = None
+    sink_tx1: Optional[str] = None
+    audio_mode_tx1: Optional[str] = None
+    audio_tx1: Optional[str] = None
+    diag_latency: Optional[str] = None
+    diag_poll_duration: Optional[str] = None
+    diag_timeouts: Optional[str] = None
+    diag_reconnects: Optional[str] = None
+
+    def get(self, key: str) -> Optional[str]:
+        return getattr(self, key, None)
+
+def _title(modes: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(mode.title() for mode in modes)
+
+def _upper(modes: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(mode.upper() for mode in modes)
+
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
     model_id: str
     display_name: str
     default_port: int
     input_count: int
     source_command: str
-    edid_modes: List[str]
-    edid_audio_sources: List[str]
+    edid_modes: Tuple[str, ...]
+    edid_audio_sources: Tuple[str, ...]
     hdr_custom_support: bool
     hdr_disable_support: bool
     cec_support: bool
-    earc_force_modes: List[str]
+    earc_force_modes: Tuple[str, ...]
     oled_support: bool
     autoswitch_support: bool
-    hdcp_modes: List[str]
-    scale_modes: Optional[List[str]] = None
-    audio_modes: Optional[List[str]] = None
+    hdcp_modes: Tuple[str, ...]
+    scale_modes: Optional[Tuple[str, ...]] = None
+    audio_modes: Optional[Tuple[str, ...]] = None
     led_modes: Optional[Dict[str, str]] = None
-    color_space_modes: Optional[List[str]] = None
-    deep_color_modes: Optional[List[str]] = None
-    output_resolutions: Optional[List[str]] = None
+    color_space_modes: Optional[Tuple[str, ...]] = None
+    deep_color_modes: Optional[Tuple[str, ...]] = None
+    output_resolutions: Optional[Tuple[str, ...]] = None
     matrix_outputs: Optional[int] = None
     audio_delay_support: bool = False
     led_brightness_support: bool = False
     edid_slots: Optional[int] = None
-    arc_force_modes: Optional[List[str]] = None
+    arc_force_modes: Optional[Tuple[str, ...]] = None
+    # Upper-case prefixes of a word in the ``get ver`` reply that identify the model.
+    fingerprints: Tuple[str, ...] = ()
+    status_queries: Tuple[StatusQuery, ...] = field(default=STATUS_QUERIES)
+    # Select entity options per setting, computed once per model: (labels, device values),
+    # and the label for each lower-cased device value.
+    select_options: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = field(
+        init=False, repr=False, compare=False
+    )
+    select_labels: Dict[str, Dict[str, str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for name in (
+            "edid_modes", "edid_audio_sources", "earc_force_modes", "hdcp_modes", "scale_modes",
+            "audio_modes", "color_space_modes", "deep_color_modes", "output_resolutions",
+            "arc_force_modes",
+        ):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, tuple(value))
+
+        led = self.led_modes or {}
+        choices = {
+            "edidmode": (_title(self.edid_modes), self.edid_modes),
+            "hdcp": (
+                tuple(mode.upper() if mode != "14" else "1.4" for mode in self.hdcp_modes),
+                tuple("1.4" if mode == "14" else mode for mode in self.hdcp_modes),
+            ),
+            "edidaudio": (_title(self.edid_audio_sources), self.edid_audio_sources),
+            "earcforce": (_title(self.earc_force_modes), self.earc_force_modes),
+            "arcforce": (_title(self.arc_force_modes or ()), self.arc_force_modes or ()),
+            "scale": (_title(self.scale_modes or ()), self.scale_modes or ()),
+            "audiomode": (_title(self.audio_modes or ()), self.audio_modes or ()),
+            "led": (tuple(led.values()), tuple(led)),
+            "colorspace": (_upper(self.color_space_modes or ()), self.color_space_modes or ()),
+            "deepcolor": (_title(self.deep_color_modes or ()), self.deep_color_modes or ()),
+            "outres": (_upper(self.output_resolutions or ()), self.output_resolutions or ()),
+        }
+        options = {key: value for key, value in choices.items() if value[0]}
+        object.__setattr__(self, "select_options", options)
+        object.__setattr__(
+            self,
+            "select_labels",
+            {
+                key: {value.lower(): label for label, value in zip(labels, values)}
+                for key, (labels, values) in options.items()
+            },
+        )
 
 VRROOM_CONFIG = ModelConfig(
     model_id="vrroom",
     display_name="VRRooM",
+    fingerprints=("VRROOM",),
     default_port=2222,
     input_count=4,
     source_command="inseltx0",
@@ -57,6 +170,7 @@ VRROOM_CONFIG = ModelConfig(
 VERTEX2_CONFIG = ModelConfig(
     model_id="vertex2",
     display_name="VERTEX2",
+    fingerprints=("VERTEX2",),
     default_port=2220,
     input_count=4,
     source_command="inseltx0",
@@ -80,6 +194,7 @@ VERTEX2_CONFIG = ModelConfig(
 VERTEX_CONFIG = ModelConfig(
     model_id="vertex",
     display_name="VERTEX",
+    fingerprints=("VERTEX",),
     default_port=2220,
     input_count=2,
     source_command="input",
@@ -101,6 +216,7 @@ VERTEX_CONFIG = ModelConfig(
 DIVA_CONFIG = ModelConfig(
     model_id="diva",
     display_name="DIVA",
+    fingerprints=("DIVA",),
     default_port=2210,
     input_count=4,
     source_command="inseltx0",
@@ -131,6 +247,7 @@ DIVA_CONFIG = ModelConfig(
 MAESTRO_CONFIG = ModelConfig(
     model_id="maestro",
     display_name="Maestro",
+    fingerprints=("MAESTRO",),
     default_port=2200,
     input_count=4,
     source_command="inseltx0",
@@ -152,6 +269,7 @@ MAESTRO_CONFIG = ModelConfig(
 ARCANA2_CONFIG = ModelConfig(
     model_id="arcana2",
     display_name="ARCANA2",
+    fingerprints=("ARCANA2", "ARCANA"),
     default_port=2222,
     input_count=1,
     source_command="",
@@ -172,6 +290,7 @@ ARCANA2_CONFIG = ModelConfig(
 DR8K_CONFIG = ModelConfig(
     model_id="dr8k",
     display_name="Dr.HDMI 8K",
+    fingerprints=("DRHDMI",),
     default_port=2201,
     input_count=1,
     source_command="",
@@ -198,9 +317,29 @@ MODEL_CONFIGS: Dict[str, ModelConfig] = {
     "dr8k": DR8K_CONFIG,
 }
 
+_FINGERPRINTS: Tuple[Tuple[str, ModelConfig], ...] = tuple(
+    sorted(
+        (
+            (fingerprint, config)
+            for config in MODEL_CONFIGS.values()
+            for fingerprint in config.fingerprints
+        ),
+        key=lambda item: len(item[0]),
+        reverse=True,
+    )
+)
+
 def get_model_config(model_id: str) -> ModelConfig:
     return MODEL_CONFIGS.get(model_id, VRROOM_CONFIG)
 
+def identify_model(version: str) -> Optional[ModelConfig]:
+    """Return the model named in a ``get ver`` reply, or None if it names no known model."""
+    words = [re.sub(r"[^A-Z0-9]", "", word) for word in re.split(r"[\s\-_/,:]+", version.upper())]
+    for fingerprint, config in _FINGERPRINTS:
+        if any(word.startswith(fingerprint) for word in words):
+            return config
+    return None
+
 def get_source_list(model_config: ModelConfig) -> List[str]:
     if model_config.input_count == 0:
         return []
@@ -209,6 +348,50 @@ def get_source_list(model_config: ModelConfig) -> List[str]:
     else:
         return [f"HDMI {i}" for i in range(model_config.input_count)]
 
+def get_status_queries(model_config: ModelConfig) -> List[StatusQuery]:
+    outputs = min(model_config.matrix_outputs or 0, 2)
+    queries = []
+    for query in model_config.status_queries:
+        if query.requires_inputs and model_config.input_count == 0:
+            continue
+        if query.per_output:
+            queries.extend(query.for_output(output) for output in range(outputs))
+        else:
+            queries.append(query)
+    return queries
+
+# ModelConfig field that enables each setting; a falsy value means the model lacks it.
+SETTING_FIELDS: Dict[str, str] = {
+    "edidmode": "edid_modes",
+    "hdcp": "hdcp_modes",
+    "edidaudio": "edid_audio_sources",
+    "earcforce": "earc_force_modes",
+    "arcforce": "arc_force_modes",
+    "scale": "scale_modes",
+    "audiomode": "audio_modes",
+    "led": "led_modes",
+    "colorspace": "color_space_modes",
+    "deepcolor": "deep_color_modes",
+    "outres": "output_resolutions",
+    "hdrcustom": "hdr_custom_support",
+    "hdrdisable": "hdr_disable_support",
+    "cec": "cec_support",
+    "oled": "oled_support",
+    "autosw": "autoswitch_support",
+}
+
+def get_setting_names(model_config: ModelConfig) -> List[str]:
+    return [setting for setting, name in SETTING_FIELDS.items() if getattr(model_config, name)]
+
+def without_settings(model_config: ModelConfig, settings: Iterable[str]) -> ModelConfig:
+    """Return a copy of *model_config* that no longer offers *settings*."""
+    changes = {}
+    for setting in settings:
+        name = SETTING_FIELDS[setting]
+        value = getattr(model_config, name)
+        changes[name] = False if isinstance(value, bool) else None if isinstance(value, dict) else ()
+    return replace(model_config, **changes) if changes else model_config
+
 def format_source_for_command(source: str, model_config: ModelConfig) -> str:
     if model_config.model_id == "vertex":
         source_map = {"Top": "top", "Bottom": "bot"}
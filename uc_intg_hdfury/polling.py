@@ -0,0 +1,97 @@
+"""
+HDFury adaptive poll scheduler.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from dataclasses import dataclass
+
+DEFAULT_INTERVAL = 20.0
+MAX_BACKOFF = 4
+BOOST_CYCLES = 3
+
+
+@dataclass
+class _Field:
+    interval: float
+    current: float
+    next_due: float = 0.0
+    last_value: str | None = None
+
+
+class PollScheduler:
+    """Decide which status queries are due, backing off fields that do not change."""
+
+    def __init__(self, intervals: dict[str, float]):
+        self._intervals = intervals
+        self._fields: dict[str, _Field] = {}
+        self._boost_remaining = 0
+        self._floors: dict[str, float] = {}
+
+    @property
+    def boosted(self) -> bool:
+        return self._boost_remaining > 0
+
+    def _field(self, command: str) -> _Field:
+        field = self._fields.get(command)
+        if field is None:
+            interval = self._intervals.get(command, DEFAULT_INTERVAL)
+            field = self._fields[command] = _Field(interval, interval)
+        return field
+
+    def due(self, commands: list[str], now: float) -> list[str]:
+        """Return the subset of *commands* that should be queried at *now*."""
+        if self._boost_remaining > 0:
+            self._boost_remaining -= 1
+            return [
+                command
+                for command in commands
+                if self._field(command).interval <= DEFAULT_INTERVAL
+                or self._field(command).next_due <= now
+            ]
+
+        due = []
+        for command in commands:
+            field = self._field(command)
+            if field.next_due <= now:
+                due.append(command)
+        return due
+
+    def record(self, command: str, value: str | None, now: float) -> None:
+        """Reschedule *command* after a reply, doubling its interval if nothing changed."""
+        field = self._field(command)
+        if value is not None and value == field.last_value:
+            field.current = min(field.current * 2, field.interval * MAX_BACKOFF)
+        else:
+            field.current = field.interval
+        if value is not None:
+            field.last_value = value
+        field.next_due = now + max(field.current, self._floors.get(command, 0.0))
+
+    def slow_down(self, command: str, interval: float) -> None:
+        """Poll *command* at most every *interval* seconds, e.g. because the device pushes it."""
+        self._floors[command] = interval
+
+    def boost(self) -> None:
+        """Poll the fast-changing fields on the next few ticks, e.g. after a user command."""
+        self._boost_remaining = BOOST_CYCLES
+        for field in self._fields.values():
+            field.current = field.interval
+
+    def replan(self, intervals: dict[str, float]) -> None:
+        """Poll *intervals* from now on, keeping the state of fields whose interval is unchanged."""
+        self._intervals = intervals
+        self._floors = {
+            command: floor for command, floor in self._floors.items() if command in intervals
+        }
+        self._fields = {
+            command: field
+            for command, field in self._fields.items()
+            if intervals.get(command) == field.interval
+        }
+
+    def reset(self) -> None:
+        self._fields.clear()
+        self._boost_remaining = 0
+        self._floors.clear()
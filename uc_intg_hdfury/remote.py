@@ -21,6 +21,8 @@ if TYPE_CHECKING:
 
 _LOG = logging.getLogger(__name__)
 
+CommandBinding = tuple[str, str]
+
 
 class HDFuryRemote(RemoteEntity):
     """HDFury remote entity with UI pages using subscribe/sync_state pattern."""
@@ -30,21 +32,21 @@ class HDFuryRemote(RemoteEntity):
         self._config = config
 
         ui_pages = self._build_ui_pages()
-        simple_commands = self._build_simple_commands()
+        self._commands = self._build_simple_commands()
 
         super().__init__(
             f"remote.{config.identifier}",
             config.name,
             [],
-            {Attributes.STATE: States.UNKNOWN},
-            simple_commands=simple_commands,
+            {Attributes.STATE: States.UNAVAILABLE},
+            simple_commands=list(self._commands),
             cmd_handler=self._handle_command,
             ui_pages=ui_pages,
         )
         self.subscribe_to_device(device)
 
     async def sync_state(self):
-        self.update({Attributes.STATE: States.ON})
+        self.update({Attributes.STATE: States.ON if self._device.available else States.UNAVAILABLE})
 
     async def _handle_command(
         self, entity: Any, cmd_id: str, params: dict[str, Any] | None
@@ -54,6 +56,10 @@ class HDFuryRemote(RemoteEntity):
                 return StatusCodes.BAD_REQUEST
 
             command = params["command"]
+            if command not in self._commands:
+                _LOG.warning("[%s] Unknown command: %s", self._device.log_id, command)
+                return StatusCodes.BAD_REQUEST
+
             _LOG.info("[%s] Command: %s", self._device.log_id, command)
 
             success = await self._execute_command(command)
@@ -63,159 +69,101 @@ class HDFuryRemote(RemoteEntity):
             if not params or "sequence" not in params:
                 return StatusCodes.BAD_REQUEST
 
-            for command in params["sequence"]:
-                if not await self._execute_command(command):
-                    return StatusCodes.SERVER_ERROR
+            sequence = params["sequence"]
+            unknown = [command for command in sequence if command not in self._commands]
+            if unknown:
+                _LOG.warning("[%s] Unknown commands: %s", self._device.log_id, unknown)
+                return StatusCodes.BAD_REQUEST
+
+            failed = await self._device.apply_settings(
+                [self._commands[command] for command in sequence]
+            )
+            if failed is not None:
+                _LOG.warning(
+                    "[%s] Sequence failed at step %d: %s",
+                    self._device.log_id,
+                    failed + 1,
+                    sequence[failed],
+                )
+                return StatusCodes.SERVER_ERROR
             return StatusCodes.OK
 
         return StatusCodes.NOT_IMPLEMENTED
 
     async def _execute_command(self, command: str) -> bool:
-        if command.startswith("set_source_"):
-            source = command.replace("set_source_", "").replace("_", " ")
-            return await self._device.set_source(source)
-
-        if command.startswith("set_edidmode_"):
-            mode = command.replace("set_edidmode_", "")
-            return await self._device.set_edid_mode(mode)
-
-        if command.startswith("set_hdcp_"):
-            mode = command.replace("set_hdcp_", "")
-            return await self._device.set_hdcp_mode(mode)
-
-        if command == "set_hdrcustom_on":
-            return await self._device.set_hdr_custom(True)
-        if command == "set_hdrcustom_off":
-            return await self._device.set_hdr_custom(False)
-
-        if command == "set_hdrdisable_on":
-            return await self._device.set_hdr_disable(True)
-        if command == "set_hdrdisable_off":
-            return await self._device.set_hdr_disable(False)
-
-        if command == "set_cec_on":
-            return await self._device.set_cec(True)
-        if command == "set_cec_off":
-            return await self._device.set_cec(False)
-
-        if command.startswith("set_earcforce_"):
-            mode = command.replace("set_earcforce_", "")
-            return await self._device.set_earc_force(mode)
-
-        if command.startswith("set_arcforce_"):
-            mode = command.replace("set_arcforce_", "")
-            return await self._device.set_arc_force(mode)
-
-        if command == "set_oled_on":
-            return await self._device.set_oled(True)
-        if command == "set_oled_off":
-            return await self._device.set_oled(False)
-
-        if command == "set_autosw_on":
-            return await self._device.set_autoswitch(True)
-        if command == "set_autosw_off":
-            return await self._device.set_autoswitch(False)
-
-        if command.startswith("set_scalemode_"):
-            mode = command.replace("set_scalemode_", "")
-            return await self._device.set_scale_mode(mode)
-
-        if command.startswith("set_colorspace_"):
-            mode = command.replace("set_colorspace_", "")
-            return await self._device.set_color_space(mode)
-
-        if command.startswith("set_deepcolor_"):
-            mode = command.replace("set_deepcolor_", "")
-            return await self._device.set_deep_color(mode)
-
-        if command.startswith("set_edidaudio_"):
-            source = command.replace("set_edidaudio_", "")
-            return await self._device.set_edid_audio(source)
-
-        if command.startswith("set_audiomode_"):
-            mode = command.replace("set_audiomode_", "")
-            return await self._device.set_audio_mode(mode)
-
-        if command.startswith("set_ledmode_"):
-            mode = command.replace("set_ledmode_", "")
-            return await self._device.set_led_mode(mode)
-
-        if command.startswith("set_outres_"):
-            res = command.replace("set_outres_", "")
-            return await self._device.set_output_resolution(res)
-
-        if command == "hotplug":
-            return await self._device.hotplug()
-
-        if command == "reboot_device":
-            return await self._device.reboot()
-
-        return await self._device.send_command(f"set {command}")
+        return await self._device.apply_setting(*self._commands[command])
 
-    def _build_simple_commands(self) -> list[str]:
-        commands = []
+    def _build_simple_commands(self) -> dict[str, CommandBinding]:
+        commands: dict[str, CommandBinding] = {}
         model = self._device.model_config
 
         for source in self._device.source_list:
-            commands.append(f"set_source_{source.replace(' ', '_')}")
+            commands[f"set_source_{source.replace(' ', '_')}"] = ("source", source)
 
         for mode in model.edid_modes:
-            commands.append(f"set_edidmode_{mode}")
+            commands[f"set_edidmode_{mode}"] = ("edidmode", mode)
 
         for mode in model.hdcp_modes:
-            commands.append(f"set_hdcp_{'14' if mode == '1.4' else mode}")
+            mode_id = "14" if mode == "1.4" else mode
+            commands[f"set_hdcp_{mode_id}"] = ("hdcp", mode_id)
 
         if model.hdr_custom_support:
-            commands.extend(["set_hdrcustom_on", "set_hdrcustom_off"])
+            commands["set_hdrcustom_on"] = ("hdrcustom", "on")
+            commands["set_hdrcustom_off"] = ("hdrcustom", "off")
 
         if model.hdr_disable_support:
-            commands.extend(["set_hdrdisable_on", "set_hdrdisable_off"])
+            commands["set_hdrdisable_on"] = ("hdrdisable", "on")
+            commands["set_hdrdisable_off"] = ("hdrdisable", "off")
 
         if model.cec_support:
-            commands.extend(["set_cec_on", "set_cec_off"])
+            commands["set_cec_on"] = ("cec", "on")
+            commands["set_cec_off"] = ("cec", "off")
 
         for mode in model.earc_force_modes:
-            commands.append(f"set_earcforce_{mode}")
+            commands[f"set_earcforce_{mode}"] = ("earcforce", mode)
 
         if model.arc_force_modes:
             for mode in model.arc_force_modes:
-                commands.append(f"set_arcforce_{mode}")
+                commands[f"set_arcforce_{mode}"] = ("arcforce", mode)
 
         if model.oled_support:
-            commands.extend(["set_oled_on", "set_oled_off"])
+            commands["set_oled_on"] = ("oled", "on")
+            commands["set_oled_off"] = ("oled", "off")
 
         if model.autoswitch_support:
-            commands.extend(["set_autosw_on", "set_autosw_off"])
+            commands["set_autosw_on"] = ("autosw", "on")
+            commands["set_autosw_off"] = ("autosw", "off")
 
         if model.scale_modes:
             for mode in model.scale_modes:
-                commands.append(f"set_scalemode_{mode}")
+                commands[f"set_scalemode_{mode}"] = ("scale", mode)
 
         if model.color_space_modes:
             for mode in model.color_space_modes:
-                commands.append(f"set_colorspace_{mode}")
+                commands[f"set_colorspace_{mode}"] = ("colorspace", mode)
 
         if model.deep_color_modes:
             for mode in model.deep_color_modes:
-                commands.append(f"set_deepcolor_{mode}")
+                commands[f"set_deepcolor_{mode}"] = ("deepcolor", mode)
 
         if model.edid_audio_sources:
             for src in model.edid_audio_sources:
-                commands.append(f"set_edidaudio_{src}")
+                commands[f"set_edidaudio_{src}"] = ("edidaudio", src)
 
         if model.audio_modes:
             for mode in model.audio_modes:
-                commands.append(f"set_audiomode_{mode}")
+                commands[f"set_audiomode_{mode}"] = ("audiomode", mode)
 
         if model.led_modes:
             for mode_id in model.led_modes:
-                commands.append(f"set_ledmode_{mode_id}")
+                commands[f"set_ledmode_{mode_id}"] = ("led", mode_id)
 
         if model.output_resolutions:
             for res in model.output_resolutions:
-                commands.append(f"set_outres_{res}")
+                commands[f"set_outres_{res}"] = ("outres", res)
 
-        commands.extend(["hotplug", "reboot_device"])
+        commands["hotplug"] = ("hotplug", "")
+        commands["reboot_device"] = ("reboot", "")
 
         return commands
 
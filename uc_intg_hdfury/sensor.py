@@ -36,7 +36,7 @@ class HDFurySensor(SensorEntity):
             name,
             [],
             {
-                Attributes.STATE: States.UNKNOWN,
+                Attributes.STATE: States.UNAVAILABLE,
                 Attributes.VALUE: "",
             },
             device_class=DeviceClasses.CUSTOM,
@@ -45,11 +45,12 @@ class HDFurySensor(SensorEntity):
         self._device = device
         self._sensor_key = sensor_key
         self.subscribe_to_device(device)
+        device.subscribe_sensor(sensor_key, self.sync_state)
 
     async def sync_state(self):
         value = self._device.get_sensor_value(self._sensor_key) or "Unknown"
         self.update({
-            Attributes.STATE: States.ON,
+            Attributes.STATE: States.ON if self._device.available else States.UNAVAILABLE,
             Attributes.VALUE: value,
         })
 
@@ -88,5 +89,11 @@ def create_sensors(config: HDFuryConfig, device: HDFuryDevice) -> list[HDFurySen
         _add("sink_tx1", "TX1 Sink", "device")
         _add("audio_tx1", "TX1 Audio", "audio")
 
+    if config.diagnostic_sensors:
+        _add("diag_latency", "Command Latency", "ms")
+        _add("diag_poll_duration", "Poll Duration", "ms")
+        _add("diag_timeouts", "Command Timeouts", "count")
+        _add("diag_reconnects", "Reconnects", "count")
+
     _LOG.info("Created %d sensor entities for %s", len(sensors), name)
     return sensors
@@ -11,12 +11,26 @@ from typing import Any
 
 from ucapi import RequestUserInput
 from ucapi_framework import BaseSetupFlow
+from ucapi_framework.discovery import DiscoveredDevice
 
 from uc_intg_hdfury.config import HDFuryConfig
-from uc_intg_hdfury.models import get_model_config
+from uc_intg_hdfury.models import get_model_config, identify_model
 
 _LOG = logging.getLogger(__name__)
 
+OPTION_FIELDS = [
+    {
+        "id": "skip_redundant_commands",
+        "label": {"en": "Skip commands that match the current device setting"},
+        "field": {"checkbox": {"value": False}},
+    },
+    {
+        "id": "diagnostic_sensors",
+        "label": {"en": "Add diagnostic sensors (latency, timeouts, reconnects)"},
+        "field": {"checkbox": {"value": False}},
+    },
+]
+
 
 class HDFurySetupFlow(BaseSetupFlow[HDFuryConfig]):
     """Setup flow for HDFury integration."""
@@ -47,6 +61,26 @@ class HDFurySetupFlow(BaseSetupFlow[HDFuryConfig]):
             ],
         )
 
+    def format_discovered_device_label(self, device: DiscoveredDevice) -> str:
+        label = f"{device.name} ({device.address})"
+        version = (device.extra_data or {}).get("version")
+        return f"{label} - {version}" if version else label
+
+    def get_additional_discovery_fields(self) -> list[dict]:
+        return OPTION_FIELDS
+
+    async def prepare_input_from_discovery(
+        self, discovered: DiscoveredDevice, additional_input: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Fill in the model and port found by the scan, as if they had been entered by hand."""
+        extra = discovered.extra_data or {}
+        return {
+            **{key: value for key, value in additional_input.items() if key != "choice"},
+            "model": extra.get("model", "vrroom"),
+            "address": discovered.address,
+            "port": extra.get("port", get_model_config(extra.get("model", "vrroom")).default_port),
+        }
+
     async def query_device(
         self, input_values: dict[str, Any]
     ) -> HDFuryConfig | RequestUserInput:
@@ -73,6 +107,7 @@ class HDFurySetupFlow(BaseSetupFlow[HDFuryConfig]):
                         "label": {"en": "Port"},
                         "field": {"number": {"value": model_config.default_port}},
                     },
+                    *OPTION_FIELDS,
                 ],
             )
 
@@ -81,26 +116,46 @@ class HDFurySetupFlow(BaseSetupFlow[HDFuryConfig]):
             raise ValueError("IP address is required")
 
         port = int(input_values.get("port", 2222))
+        skip_redundant = (
+            str(input_values.get("skip_redundant_commands", False)).strip().lower() == "true"
+        )
+        diagnostic_sensors = (
+            str(input_values.get("diagnostic_sensors", False)).strip().lower() == "true"
+        )
         model_config = get_model_config(model_id)
 
-        if not await self._test_connection(address, port):
+        version = await self._test_connection(address, port)
+        if version is None:
             raise ValueError(f"Cannot connect to HDFury device at {address}:{port}")
 
+        detected = identify_model(version)
+        if detected and detected is not model_config:
+            _LOG.warning(
+                "Selected %s but the device reports %r, using %s",
+                model_config.display_name,
+                version,
+                detected.display_name,
+            )
+            model_id, model_config = detected.model_id, detected
+
         identifier = f"hdfury_{address.replace('.', '_')}"
         name = f"HDFury {model_config.display_name}"
 
         _LOG.info("Setup complete for %s at %s:%d", name, address, port)
 
+        # A fresh config has no record of unanswered queries, so the device is probed again.
         return HDFuryConfig(
             identifier=identifier,
             name=name,
             address=address,
             port=port,
             model_id=model_id,
+            skip_redundant_commands=skip_redundant,
+            diagnostic_sensors=diagnostic_sensors,
         )
 
-    async def _test_connection(self, address: str, port: int) -> bool:
-        """Test TCP connection to HDFury device."""
+    async def _test_connection(self, address: str, port: int) -> str | None:
+        """Return the device's ``get ver`` reply ("" if it gives none), or None if unreachable."""
         try:
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(address, port),
@@ -115,16 +170,18 @@ class HDFurySetupFlow(BaseSetupFlow[HDFuryConfig]):
             writer.write(b"get ver\r\n")
             await writer.drain()
 
+            version = ""
             try:
                 response = await asyncio.wait_for(reader.readline(), timeout=3.0)
-                _LOG.info("HDFury response: %s", response.decode("ascii", errors="ignore").strip())
+                version = response.decode("ascii", errors="ignore").strip(" \r\n>")
+                _LOG.info("HDFury response: %s", version)
             except asyncio.TimeoutError:
                 pass
 
             writer.close()
             await writer.wait_closed()
-            return True
+            return version
 
         except Exception as err:
             _LOG.warning("Connection test failed: %s", err)
-            return False
+            return None